@@ -0,0 +1,109 @@
+# bench_startup.py
+"""
+Startup regression check for the Weather App.
+
+Imports main.py in a fresh interpreter with `python -X importtime`, reports the
+slowest imports, and fails (exit code 1) if
+  - a module that should load lazily (httpx, weather_service, dotenv) is imported
+    at startup, or
+  - importing main takes longer than the budget, or more than --tolerance over a
+    saved baseline.
+
+    python bench_startup.py                        # check against the default budget
+    python bench_startup.py --save-baseline startup_baseline.json
+    python bench_startup.py --baseline startup_baseline.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+LAZY_MODULES = ("httpx", "weather_service", "dotenv")
+DEFAULT_BUDGET_MS = 600.0
+DEFAULT_RUNS = 5
+
+
+def parse_importtime(stderr):
+    """Parses -X importtime output into {module: (self_us, cumulative_us)}."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # the header line
+        timings[parts[2].strip()] = (self_us, cumulative_us)
+    return timings
+
+
+def measure(module="main", runs=DEFAULT_RUNS):
+    """Imports module in `runs` fresh interpreters. Returns (median ms, timings of the median run)."""
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=APP_DIR,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+        timings = parse_importtime(result.stderr)
+        samples.append((timings[module][1] / 1000, timings))
+    samples.sort(key=lambda sample: sample[0])
+    return samples[len(samples) // 2]
+
+
+def check(total_ms, timings, budget_ms, baseline_ms=None, tolerance=0.2):
+    """Returns a list of problems (empty if startup is within budget)."""
+    problems = []
+    eager = [name for name in timings if name.split(".")[0] in LAZY_MODULES]
+    if eager:
+        problems.append(f"imported at startup but should be lazy: {', '.join(sorted(eager))}")
+    if total_ms > budget_ms:
+        problems.append(f"import main took {total_ms:.0f} ms, budget is {budget_ms:.0f} ms")
+    if baseline_ms is not None and total_ms > baseline_ms * (1 + tolerance):
+        problems.append(
+            f"import main took {total_ms:.0f} ms, more than {tolerance:.0%} over the baseline {baseline_ms:.0f} ms"
+        )
+    return problems
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the Weather App's startup import time")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--baseline", help="JSON file written by --save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown over the baseline")
+    parser.add_argument("--save-baseline", metavar="FILE")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    args = parser.parse_args()
+
+    total_ms, timings = measure(runs=args.runs)
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)
+    print(f"import main: {total_ms:.1f} ms (median of {args.runs})\n")
+    print(f"{'module':<40}{'self ms':>10}{'cumul ms':>10}")
+    for name, (self_us, cumulative_us) in slowest[:args.top]:
+        print(f"{name:<40}{self_us / 1000:>10.1f}{cumulative_us / 1000:>10.1f}")
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps({"import_main_ms": total_ms}, indent=2))
+        print(f"\nbaseline saved to {args.save_baseline}")
+
+    baseline_ms = None
+    if args.baseline:
+        baseline_ms = json.loads(Path(args.baseline).read_text())["import_main_ms"]
+    problems = check(total_ms, timings, args.budget_ms, baseline_ms, args.tolerance)
+    print()
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ Startup within budget")
@@ -0,0 +1,111 @@
+"""Weather condition classification for the Weather App."""
+
+from collections import namedtuple
+from functools import lru_cache
+
+# severity levels
+CALM = 0
+MINOR = 1
+MODERATE = 2
+SEVERE = 3
+
+Condition = namedtuple("Condition", ("icon", "color", "severity"))
+
+CLEAR = Condition("☀", "#FFEE88", CALM)
+CLOUDS = Condition("☁", "#C9D6DF", CALM)
+DRIZZLE = Condition("🌦", "#90C4F7", MINOR)
+RAIN = Condition("🌧", "#90C4F7", MINOR)
+HEAVY_RAIN = Condition("🌧", "#6FA8DC", MODERATE)
+THUNDERSTORM = Condition("⛈", "#735D78", MODERATE)
+SEVERE_THUNDERSTORM = Condition("⛈", "#735D78", SEVERE)
+SNOW = Condition("❄", "#D8F3FF", MINOR)
+HEAVY_SNOW = Condition("❄", "#D8F3FF", MODERATE)
+FOG = Condition("🌫", "#E0E0E0", MINOR)
+DUST = Condition("🌫", "#E8D9B5", MODERATE)
+SQUALL = Condition("💨", "#B0BEC5", SEVERE)
+TORNADO = Condition("🌪", "#735D78", SEVERE)
+UNKNOWN = Condition("🌡", "#F5F5F5", CALM)
+
+
+def _build_code_table():
+    """
+    Maps every OpenWeatherMap condition code (weather[0].id) to a Condition.
+    https://openweathermap.org/weather-conditions
+    """
+    table = {}
+    # whole groups first, then the codes that need something more specific
+    for code in range(200, 300):
+        table[code] = THUNDERSTORM
+    for code in range(300, 400):
+        table[code] = DRIZZLE
+    for code in range(500, 600):
+        table[code] = RAIN
+    for code in range(600, 700):
+        table[code] = SNOW
+    for code in range(700, 800):
+        table[code] = FOG
+    table[800] = CLEAR
+    for code in range(801, 900):
+        table[code] = CLOUDS
+
+    for code in (202, 212, 221, 232):  # heavy / ragged thunderstorms
+        table[code] = SEVERE_THUNDERSTORM
+    for code in (502, 503, 504, 522, 531):  # heavy and extreme rain
+        table[code] = HEAVY_RAIN
+    table[511] = HEAVY_SNOW._replace(icon="🌨")  # freezing rain
+    for code in (602, 622):  # heavy snow
+        table[code] = HEAVY_SNOW
+    for code in (611, 612, 613, 615, 616):  # sleet, rain and snow
+        table[code] = SNOW._replace(icon="🌨")
+    for code in (731, 751, 761, 762):  # dust, sand, volcanic ash
+        table[code] = DUST
+    table[771] = SQUALL
+    table[781] = TORNADO
+    return table
+
+
+CONDITIONS_BY_CODE = _build_code_table()
+
+# Keyword rules for when only the description text is available, checked in order.
+# Thunder comes before rain so "thunderstorm with light rain" is a thunderstorm.
+DESCRIPTION_RULES = (
+    (("tornado",), TORNADO),
+    (("squall",), SQUALL),
+    (("thunder",), THUNDERSTORM),
+    (("snow", "sleet"), SNOW),
+    (("freezing rain",), HEAVY_SNOW._replace(icon="🌨")),
+    (("heavy intensity rain", "very heavy rain", "extreme rain"), HEAVY_RAIN),
+    (("drizzle",), DRIZZLE),
+    (("rain", "shower"), RAIN),
+    (("dust", "sand", "ash"), DUST),
+    (("mist", "fog", "haze", "smoke"), FOG),
+    (("clear",), CLEAR),
+    (("cloud", "broken", "scattered", "overcast"), CLOUDS),
+)
+
+
+@lru_cache(maxsize=256)
+def classify_description(description):
+    """Classifies a condition from its description text (memoized; there are only a few dozen)."""
+    desc = description.lower()
+    for keywords, condition in DESCRIPTION_RULES:
+        if any(keyword in desc for keyword in keywords):
+            return condition
+    return UNKNOWN
+
+
+def classify(code=None, description=""):
+    """
+    Returns the Condition (icon, color, severity) for an OpenWeatherMap condition
+    code, falling back to the description text when the code is missing or unknown.
+    """
+    condition = CONDITIONS_BY_CODE.get(code)
+    if condition is not None:
+        return condition
+    return classify_description(description or "")
+
+
+def classify_weather(item):
+    """Classifies an API item with a "weather" list (current weather or a forecast entry)."""
+    weather = (item.get("weather") or [{}])[0]
+    return classify(weather.get("id"), weather.get("description", ""))
@@ -1,10 +1,6 @@
 """Configuration management for the Weather App."""
 
 import os
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 class Config:
     """Application configuration."""
@@ -26,9 +22,24 @@ class Config:
     API_UNITS = "metric" 
     TIMEOUT = 10 
     
+    _env_loaded = False
+
+    @classmethod
+    def load_env(cls):
+        """Load the .env file (once) and refresh the API settings from it."""
+        if cls._env_loaded:
+            return
+        # imported here so that starting the app doesn't pay for it
+        from dotenv import load_dotenv
+        load_dotenv()
+        cls.API_KEY = os.getenv("OPENWEATHER_API_KEY", "")
+        cls.BASE_URL = os.getenv("OPENWEATHER_BASE_URL", cls.BASE_URL)
+        cls._env_loaded = True
+
     @classmethod
     def validate(cls):
         """Validate that required configuration is present."""
+        cls.load_env()
         if not cls.API_KEY:
             # This raises an error if the key is missing.
             raise ValueError(
@@ -37,5 +48,5 @@ class Config:
             )
         return True
 
-# Validate configuration on import
-Config.validate()
\ No newline at end of file
+# Validation happens when the weather service is created (WeatherService.__init__),
+# not on import, so the window can appear before .env is read.
\ No newline at end of file
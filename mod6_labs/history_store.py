@@ -0,0 +1,202 @@
+"""Search history storage for the Weather App."""
+
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+HISTORY_VERSION = 2
+MAX_ENTRIES = 50
+FLUSH_DELAY = 1.0  # seconds to wait for more changes before writing the file
+HALF_LIFE = 7 * 24 * 60 * 60  # a visit counts half as much after a week
+
+
+class HistoryStore:
+    """
+    Remembers searched cities ranked by frecency (how often and how recently each was
+    searched), along with the OpenWeatherMap city ID and the last weather payload.
+
+    Entries live in a dict keyed by the normalized city name, so recording a search is
+    O(1). Changes are written to disk on a background timer: several searches in quick
+    succession become one write, and the file is replaced atomically (written to a
+    temporary file, then renamed), so a crash can't leave it half-written.
+
+    The old format (a plain JSON list of names, most recent first) is migrated on load.
+    """
+
+    def __init__(self, path, max_entries=MAX_ENTRIES, flush_delay=FLUSH_DELAY):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.flush_delay = flush_delay
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()  # keeps an older snapshot from overwriting a newer one
+        self._timer = None
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def _key(city):
+        return " ".join(city.split()).casefold()
+
+    @staticmethod
+    def _rank(entry):
+        # log of the decayed score, shifted so it doesn't depend on the current time:
+        # comparing these orders entries the same as comparing score * 0.5 ** (age / HALF_LIFE)
+        return math.log2(max(entry["score"], 1e-9)) + entry["last_used"] / HALF_LIFE
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            # keep the unreadable file for inspection instead of silently overwriting it
+            backup = self.path.with_name(self.path.name + ".corrupt")
+            logger.warning("Could not read %s (%s); moved it to %s", self.path, e, backup)
+            try:
+                os.replace(self.path, backup)
+            except OSError:
+                pass
+            return
+
+        if isinstance(data, list):
+            # version 1: city names, most recent first
+            now = time.time()
+            entries = [
+                {"city": city, "city_id": None, "score": 1.0, "count": 1,
+                 "last_used": now - i, "payload": None}
+                for i, city in enumerate(data) if isinstance(city, str)
+            ]
+            self._dirty = True
+        elif isinstance(data, dict):
+            entries = data.get("entries", [])
+        else:
+            entries = []
+
+        for entry in entries:
+            try:
+                key = self._key(entry["city"])
+                entry["score"] = float(entry.get("score", 1.0))
+                entry["last_used"] = float(entry["last_used"])
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            entry.setdefault("count", 1)
+            entry.setdefault("city_id", None)
+            entry.setdefault("payload", None)
+            self._entries[key] = entry
+        if self._dirty:
+            self._schedule_flush()
+
+    def record(self, city, city_id=None, payload=None, now=None):
+        """Counts a successful search for city, remembering its ID and payload."""
+        now = time.time() if now is None else now
+        city = " ".join(city.split()).title()
+        key = self._key(city)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {
+                    "city": city, "city_id": None, "score": 0.0, "count": 0,
+                    "last_used": now, "payload": None,
+                }
+            decay = 0.5 ** (max(0.0, now - entry["last_used"]) / HALF_LIFE)
+            entry["score"] = entry["score"] * decay + 1.0
+            entry["count"] += 1
+            entry["last_used"] = now
+            if city_id is not None:
+                entry["city_id"] = city_id
+            if payload is not None:
+                entry["payload"] = payload
+            if len(self._entries) > self.max_entries:
+                lowest = min(self._entries, key=lambda k: self._rank(self._entries[k]))
+                del self._entries[lowest]
+            self._dirty = True
+        self._schedule_flush()
+
+    def remove(self, city):
+        with self._lock:
+            if self._entries.pop(self._key(city), None) is None:
+                return
+            self._dirty = True
+        self._schedule_flush()
+
+    def get(self, city):
+        """Returns a copy of the entry for city, or None."""
+        with self._lock:
+            entry = self._entries.get(self._key(city))
+            return dict(entry) if entry else None
+
+    def cities(self, limit=None):
+        """City names, best frecency first."""
+        with self._lock:
+            ranked = sorted(self._entries.values(), key=self._rank, reverse=True)
+        return [entry["city"] for entry in ranked[:limit]]
+
+    def most_recent(self):
+        """The most recently searched entry (a copy), or None."""
+        with self._lock:
+            if not self._entries:
+                return None
+            return dict(max(self._entries.values(), key=lambda entry: entry["last_used"]))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _schedule_flush(self):
+        with self._lock:
+            if self._timer is not None:
+                return  # a flush is already pending and will include this change
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Writes pending changes now (normally called from the background timer)."""
+        with self._write_lock:
+            with self._lock:
+                self._timer = None
+                if not self._dirty:
+                    return
+                data = json.dumps(
+                    {"version": HISTORY_VERSION, "entries": list(self._entries.values())},
+                    ensure_ascii=False,
+                )
+                self._dirty = False
+            try:
+                self._write_atomic(data)
+            except OSError as e:
+                logger.warning("Could not save search history: %s", e)
+                with self._lock:
+                    self._dirty = True
+
+    def _write_atomic(self, data):
+        directory = self.path.parent
+        fd, tmp_path = tempfile.mkstemp(prefix=self.path.name, suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def close(self):
+        """Cancels the pending timer and writes any unsaved changes."""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush()
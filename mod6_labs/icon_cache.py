@@ -0,0 +1,150 @@
+"""Local cache for OpenWeatherMap condition icons."""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+ASSETS_DIR = Path(__file__).resolve().parent / "assets"
+ICON_SUBDIR = "icons"
+ICON_URL = "https://openweathermap.org/img/wn/{code}@2x.png"
+FETCH_TIMEOUT = 5.0
+RETRY_AFTER = 300.0  # seconds before an icon that failed to download is tried again
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Every condition icon OpenWeatherMap uses (day and night variants)
+ICON_CODES = tuple(
+    f"{number}{variant}"
+    for number in ("01", "02", "03", "04", "09", "10", "11", "13", "50")
+    for variant in ("d", "n")
+)
+
+
+class IconCache:
+    """
+    Keeps weather icons in the app's assets directory so Flet can serve them locally.
+
+    Files are content-addressed (named after the SHA-256 of their bytes), so an icon
+    is stored once however many codes share it and a file never changes once written.
+    index.json maps each icon code to its file. Missing icons are downloaded on
+    demand; on a machine that is offline, src() returns None and callers fall back
+    to an emoji. A failed download isn't retried for retry_after seconds, so while
+    the icon host is unreachable searches don't each wait for the same timeout.
+    """
+
+    def __init__(self, assets_dir=ASSETS_DIR, retry_after=RETRY_AFTER):
+        self.assets_dir = Path(assets_dir)
+        self.icon_dir = self.assets_dir / ICON_SUBDIR
+        self.index_path = self.icon_dir / "index.json"
+        self._index = self._load_index()
+        self._lock = threading.Lock()  # store() runs on worker threads
+        self._pending = {}  # code -> Task, so concurrent requests share one download
+        self.retry_after = retry_after
+        self._failed = {}  # code -> time.monotonic() of the last failed download
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable icon index %s: %s", self.index_path, e)
+            return {}
+        # drop entries whose file has gone missing
+        return {
+            code: name for code, name in index.items()
+            if isinstance(name, str) and (self.icon_dir / name).is_file()
+        }
+
+    def _write_atomic(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def src(self, code):
+        """The asset path for an icon code (e.g. "/icons/3fa2....png"), or None if not cached."""
+        name = self._index.get(code)
+        return f"/{ICON_SUBDIR}/{name}" if name else None
+
+    def store(self, code, data):
+        """Saves icon bytes for code and returns its asset path."""
+        if not data.startswith(PNG_SIGNATURE):
+            raise ValueError(f"icon {code} is not a PNG")
+        name = f"{hashlib.sha256(data).hexdigest()[:32]}.png"
+        path = self.icon_dir / name
+        with self._lock:
+            self.icon_dir.mkdir(parents=True, exist_ok=True)
+            if not path.exists():
+                self._write_atomic(path, data)
+            if self._index.get(code) != name:
+                self._index[code] = name
+                self._write_atomic(self.index_path, json.dumps(self._index, indent=2, sort_keys=True).encode())
+        return self.src(code)
+
+    async def _download(self, client, code):
+        try:
+            response = await client.get(ICON_URL.format(code=code))
+            response.raise_for_status()
+            src = await asyncio.to_thread(self.store, code, response.content)
+            self._failed.pop(code, None)
+            return src
+        except Exception as e:
+            logger.info("Could not fetch icon %s: %s", code, e)
+            self._failed[code] = time.monotonic()
+            return None
+        finally:
+            self._pending.pop(code, None)
+
+    async def ensure(self, codes, timeout=FETCH_TIMEOUT):
+        """
+        Makes sure the given icon codes are cached, downloading any that are missing.
+        Returns {code: asset path or None}; failures (e.g. offline) map to None, and
+        codes that failed within the last retry_after seconds aren't tried again yet.
+        """
+        codes = [code for code in dict.fromkeys(codes) if code]
+        now = time.monotonic()
+        missing = [
+            code for code in codes
+            if self.src(code) is None and now - self._failed.get(code, -math.inf) >= self.retry_after
+        ]
+        if missing:
+            import httpx  # only needed when something has to be downloaded
+
+            async with httpx.AsyncClient(timeout=timeout) as client:
+                tasks = []
+                for code in missing:
+                    task = self._pending.get(code)
+                    if task is None:
+                        task = self._pending[code] = asyncio.ensure_future(self._download(client, code))
+                    tasks.append(task)
+                await asyncio.gather(*tasks)
+        return {code: self.src(code) for code in codes}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-seed the weather icon cache")
+    parser.add_argument("--assets-dir", default=str(ASSETS_DIR))
+    args = parser.parse_args()
+
+    cache = IconCache(args.assets_dir)
+    result = asyncio.run(cache.ensure(ICON_CODES))
+    cached = sum(1 for src in result.values() if src)
+    print(f"{cached}/{len(ICON_CODES)} icons cached in {cache.icon_dir}")
@@ -1,14 +1,27 @@
 """Weather Application using Flet - Complete Code with fixes"""
 
+import time
+
+STARTUP_T0 = time.perf_counter()
+
 import flet as ft
-import json
+import asyncio
+import importlib
+import logging
 from pathlib import Path
 import datetime
 from collections import defaultdict
 
-# Assuming these modules are defined elsewhere and available
-from weather_service import WeatherService
+# The service layer (and httpx behind it) is imported after the first paint,
+# see WeatherApp.get_service; bench_startup.py checks that it stays that way.
+from conditions import SEVERE, UNKNOWN, classify, classify_weather
 from config import Config
+from history_store import HistoryStore
+from icon_cache import ASSETS_DIR, IconCache
+
+logger = logging.getLogger(__name__)
+
+HISTORY_DROPDOWN_SIZE = 10
 
 
 class WeatherApp:
@@ -16,14 +29,18 @@ class WeatherApp:
 
     def __init__(self, page: ft.Page):
         self.page = page
-        self.weather_service = WeatherService()
+        self.weather_service = None  # created by get_service()
+        self.service_module = None
+        self._service_task = None  # the in-flight import, shared by every caller
         self.history_file = Path("search_history.json")
-        self.search_history = self.load_history()
+        self.history = HistoryStore(self.history_file)
+        self.icon_cache = IconCache()
         # self.current_unit tracks the displayed unit ('metric' or 'imperial')
         self.current_unit = "metric" 
         # API fetches in metric, store these base values
         self.current_temp_c = None
         self.current_feels_like_c = None
+        self.current_condition = UNKNOWN  # (icon, color, severity) of the displayed weather
         self.forecast_data = None 
         self.weather_container = None
         self.forecast_container = None
@@ -41,6 +58,8 @@ class WeatherApp:
         self.page.window.center()
         self.page.animate_theme_mode = True
         self.page.theme_animation_duration = 500
+        # write out any history changes still waiting for the background flush
+        self.page.on_close = lambda e: self.history.close()
 
     def build_ui(self):
         # Title
@@ -72,7 +91,7 @@ class WeatherApp:
         # Search history dropdown
         self.history_dropdown = ft.Dropdown(
             label="Recent Searches",
-            options=[ft.dropdown.Option(city) for city in self.search_history],
+            options=[ft.dropdown.Option(city) for city in self.history.cities(HISTORY_DROPDOWN_SIZE)],
             on_change=self.on_history_select,
             width=300
         )
@@ -92,21 +111,6 @@ class WeatherApp:
             style=ft.ButtonStyle(bgcolor=ft.Colors.BLUE_700, color=ft.Colors.WHITE),
         )
 
-        # Weather container (for current weather)
-        self.weather_container = ft.Container(
-            visible=False,
-            border_radius=10,
-            padding=20,
-            animate_opacity=300,
-        )
-
-        # Forecast container
-        self.forecast_container = ft.Container(
-            visible=False,
-            padding=10,
-            animate_opacity=300,
-        )
-
         # Error message
         self.error_message = ft.Text(
             "",
@@ -129,8 +133,7 @@ class WeatherApp:
                 ft.Divider(height=20, color=ft.Colors.TRANSPARENT),
                 self.loading,
                 self.error_message,
-                self.weather_container,
-                self.forecast_container,
+                # weather and forecast containers are added by build_result_containers()
             ],
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
             spacing=15,
@@ -140,6 +143,77 @@ class WeatherApp:
 
         self.page.add(self.main_column)
 
+        # Show the last session's weather straight away, then load the service layer
+        self.page.run_task(self.show_last_session)
+        self.page.run_task(self.warm_up_service)
+
+    def build_result_containers(self):
+        """Creates the weather and forecast containers the first time there is something to show."""
+        if self.weather_container is not None:
+            return
+        # Weather container (for current weather)
+        self.weather_container = ft.Container(
+            visible=False,
+            border_radius=10,
+            padding=20,
+            animate_opacity=300,
+        )
+
+        # Forecast container
+        self.forecast_container = ft.Container(
+            visible=False,
+            padding=10,
+            animate_opacity=300,
+        )
+        self.main_column.controls.extend([self.weather_container, self.forecast_container])
+        self.main_column.update()
+
+    def hide_results(self):
+        if self.weather_container is not None:
+            self.weather_container.visible = False
+            self.forecast_container.visible = False
+
+    async def _load_service(self):
+        module = await asyncio.to_thread(importlib.import_module, "weather_service")
+        service = module.WeatherService()  # raises ValueError if the API key is missing
+        self.service_module, self.weather_service = module, service
+        return service
+
+    async def get_service(self):
+        """
+        Imports the service layer (and httpx) on first use, off the event loop. A search
+        started while the startup warm-up is still importing waits for the same import.
+        """
+        if self.weather_service is not None:
+            return self.weather_service
+        if self._service_task is None:
+            self._service_task = asyncio.ensure_future(self._load_service())
+        task = self._service_task
+        try:
+            # shielded so a cancelled search doesn't cancel the import for everyone else
+            return await asyncio.shield(task)
+        except Exception:
+            if self._service_task is task:
+                self._service_task = None  # retry (and report the error again) next time
+            raise
+
+    async def warm_up_service(self):
+        try:
+            await self.get_service()
+        except ValueError:
+            pass  # reported when the user searches
+        logger.info("service layer ready %.0f ms after start", (time.perf_counter() - STARTUP_T0) * 1000)
+
+    async def show_last_session(self):
+        entry = self.history.most_recent()
+        if entry and entry.get("payload"):
+            fetched = datetime.datetime.fromtimestamp(entry["payload"].get("fetched_at", 0))
+            await self.show_cached(
+                entry["payload"], f"Last session: {entry['city']}, updated {fetched:%b %d, %I:%M %p}."
+            )
+            self.page.update()
+        logger.info("first paint %.0f ms after start", (time.perf_counter() - STARTUP_T0) * 1000)
+
     def c_to_f(self, temp_c):
         """Converts Celsius to Fahrenheit."""
         return (temp_c * 9/5) + 32
@@ -165,15 +239,25 @@ class WeatherApp:
 
         self.loading.visible = True
         self.error_message.visible = False
-        self.weather_container.visible = False
-        self.forecast_container.visible = False
+        self.hide_results()
         self.page.update()
 
+        # A city picked from history has a known ID, which avoids ambiguous name lookups
+        entry = self.history.get(city)
+        city_id = entry["city_id"] if entry else None
+
+        try:
+            service = await self.get_service()
+        except ValueError as e:
+            self.loading.visible = False
+            self.show_error(str(e))
+            return
+
         try:
             # Current weather
-            weather_data = await self.weather_service.get_weather(city)
+            weather_data = await service.get_weather(city, city_id=city_id)
             # Forecast (Data will be in metric as per weather_service.py config)
-            self.forecast_data = await self.weather_service.get_forecast(city)
+            self.forecast_data = await service.get_forecast(city, city_id=city_id)
 
             # Store base metric values
             self.current_temp_c = weather_data.get("main", {}).get("temp", 0)
@@ -184,37 +268,53 @@ class WeatherApp:
             self.unit_button.text = "°C"
 
             # Save to history
-            self.add_to_history(city)
+            self.add_to_history(city, weather_data, self.forecast_data)
             self.update_history_dropdown()
 
+            # Download any condition icons we don't have yet (they're served locally afterwards)
+            await self.icon_cache.ensure(self.icon_codes(weather_data, self.forecast_data))
+
             # Display weather (uses current_temp_c, but handles conversion in display)
             await self.display_weather(weather_data)
             # Await the initial forecast display
             await self.display_forecast(self.forecast_data) 
 
+        except self.service_module.WeatherServiceError as e:
+            payload = entry.get("payload") if entry else None
+            if payload:
+                fetched = datetime.datetime.fromtimestamp(payload.get("fetched_at", 0))
+                await self.show_cached(
+                    payload,
+                    f"⚠ {e} Showing saved data from {fetched:%b %d, %I:%M %p}.",
+                    ft.Colors.ORANGE_700,
+                )
+            else:
+                self.show_error(str(e))
         except Exception as e:
             self.show_error(str(e))
         finally:
             self.loading.visible = False
             self.page.update()
 
-    def get_weather_visuals(self, description: str):
-        desc = description.lower()
-        if "clear" in desc:
-            return "☀", "#FFEE88"
-        if "cloud" in desc or "broken" in desc or "scattered" in desc:
-            return "☁", "#C9D6DF"
-        if "rain" in desc:
-            return "🌧", "#90C4F7"
-        if "thunder" in desc:
-            return "⛈", "#735D78"
-        if "snow" in desc:
-            return "❄", "#D8F3FF"
-        if "mist" in desc or "fog" in desc:
-            return "🌫", "#E0E0E0"
-        return "🌡", "#F5F5F5"
+    def icon_codes(self, weather_data: dict, forecast_data: dict):
+        """All condition icon codes used by a weather/forecast payload pair."""
+        items = [weather_data] + (forecast_data or {}).get("list", [])
+        return [item.get("weather", [{}])[0].get("icon") for item in items]
+
+    def icon_control(self, icon_code: str, emoji: str, size: int):
+        """The cached condition icon, or the emoji if it isn't available (e.g. offline)."""
+        src = self.icon_cache.src(icon_code)
+        if src:
+            return ft.Image(src=src, width=size, height=size)
+        return ft.Container(
+            content=ft.Text(emoji, size=size * 0.6),
+            width=size,
+            height=size,
+            alignment=ft.alignment.center,
+        )
 
     async def display_weather(self, data: dict):
+        self.build_result_containers()
         city_name = data.get("name", "Unknown")
         country = data.get("sys", {}).get("country", "")
         humidity = data.get("main", {}).get("humidity", 0)
@@ -223,7 +323,8 @@ class WeatherApp:
         wind_speed = data.get("wind", {}).get("speed", 0)
 
         # Determine visual cues
-        emoji, light_bg_color = self.get_weather_visuals(description)
+        self.current_condition = classify_weather(data)
+        emoji, light_bg_color, severity = self.current_condition
 
         if self.page.theme_mode == ft.ThemeMode.LIGHT:
             self.page.bgcolor = light_bg_color
@@ -247,11 +348,7 @@ class WeatherApp:
                 ft.Text(f"{city_name}, {country}", size=24, weight=ft.FontWeight.BOLD),
                 ft.Row(
                     [
-                        ft.Image(
-                            src=f"https://openweathermap.org/img/wn/{icon_code}@2x.png",
-                            width=100,
-                            height=100,
-                        ),
+                        self.icon_control(icon_code, emoji, 100),
                         ft.Text(f"{emoji} {description}", size=20, italic=True)
                     ],
                     alignment=ft.MainAxisAlignment.CENTER
@@ -266,7 +363,14 @@ class WeatherApp:
                         self.create_info_card(ft.Icons.AIR, "Wind Speed", f"{wind_speed} m/s")
                     ],
                     alignment=ft.MainAxisAlignment.SPACE_EVENLY
-                )
+                ),
+                ft.Text(
+                    "⚠ Severe weather conditions",
+                    size=14,
+                    weight=ft.FontWeight.BOLD,
+                    color=ft.Colors.RED_700,
+                    visible=severity >= SEVERE,
+                ),
             ],
             spacing=10,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER
@@ -279,6 +383,7 @@ class WeatherApp:
         """
         Aggregates min/max temp and condition across all 3-hour intervals for each day.
         """
+        self.build_result_containers()
         forecast_list = data.get("list", [])
         
         # Dictionary to hold aggregated daily data: {date: [data_points]}
@@ -317,6 +422,7 @@ class WeatherApp:
             midday_point = day_points[len(day_points) // 2]
             description = midday_point.get("weather", [{}])[0].get("description", "").title()
             icon_code = midday_point.get("weather", [{}])[0].get("icon", "01d")
+            condition_id = midday_point.get("weather", [{}])[0].get("id")
 
             # Find the true min/max temperatures for the day from all data points
             for point in day_points:
@@ -336,7 +442,8 @@ class WeatherApp:
                 'min_temp_c': min_temp,
                 'max_temp_c': max_temp,
                 'description': description,
-                'icon_code': icon_code
+                'icon_code': icon_code,
+                'condition_id': condition_id
             })
         summary_cards = []
         unit_symbol = "°F" if self.current_unit == "imperial" else "°C"
@@ -357,7 +464,7 @@ class WeatherApp:
                 temp_min_display = min_temp_c
                 temp_max_display = max_temp_c
 
-            emoji, _ = self.get_weather_visuals(item['description'])
+            emoji = classify(item['condition_id'], item['description']).icon
 
             # highlight weekends
             is_weekend = date_obj and date_obj.weekday() in (5, 6)
@@ -373,7 +480,7 @@ class WeatherApp:
                 content=ft.Column(
                     [
                         ft.Text(weekday_short, size=12, weight=ft.FontWeight.BOLD),
-                        ft.Image(src=f"https://openweathermap.org/img/wn/{item['icon_code']}@2x.png", width=60, height=60),
+                        self.icon_control(item['icon_code'], emoji, 60),
                         ft.Text(f"{emoji} {item['description']}", size=11, text_align=ft.TextAlign.CENTER),
                         # DISPLAY CONVERTED TEMPS
                         ft.Text(f"{temp_min_display:.0f}{unit_symbol} / {temp_max_display:.0f}{unit_symbol}", size=12),
@@ -440,11 +547,27 @@ class WeatherApp:
             height=90
         )
 
+    async def show_cached(self, payload: dict, note: str, note_color=ft.Colors.GREY_700):
+        """Shows saved weather for a city (last session, or when a fresh fetch fails)."""
+        weather_data = payload["weather"]
+        self.forecast_data = payload.get("forecast")
+        self.current_temp_c = weather_data.get("main", {}).get("temp", 0)
+        self.current_feels_like_c = weather_data.get("main", {}).get("feels_like", 0)
+        self.current_unit = "metric"
+        self.unit_button.text = "°C"
+
+        await self.display_weather(weather_data)
+        if self.forecast_data:
+            await self.display_forecast(self.forecast_data)
+        self.error_message.value = note
+        self.error_message.color = note_color
+        self.error_message.visible = True
+
     def show_error(self, msg: str):
         self.error_message.value = f"❌ {msg}"
+        self.error_message.color = ft.Colors.RED_700
         self.error_message.visible = True
-        self.weather_container.visible = False
-        self.forecast_container.visible = False
+        self.hide_results()
         self.page.update()
 
     def toggle_units(self, e):
@@ -470,7 +593,7 @@ class WeatherApp:
 
     async def update_display(self):
         """Updates both current weather and forecast asynchronously."""
-        if not self.weather_container.content:
+        if self.weather_container is None or not self.weather_container.content:
             # Must call page.update() here, even if early exit, to update the unit button's text
             # and theme change if it was an empty state.
             self.page.update() # NO AWAIT HERE
@@ -487,16 +610,7 @@ class WeatherApp:
             feels_to_display = self.c_to_f(feels_to_display)
 
         if self.page.theme_mode == ft.ThemeMode.LIGHT:
-            # Fixed logic to safely extract description from nested controls
-            description_text_control = self.weather_container.content.controls[1].controls[1]
-            description_text = description_text_control.value if isinstance(description_text_control, ft.Text) else ""
-            
-            # The emoji is the first character, description starts after the space
-            description = description_text.split(" ", 1)[-1].strip() if " " in description_text else description_text
-            
-            _, light_bg_color = self.get_weather_visuals(description)
-
-            self.page.bgcolor = light_bg_color
+            self.page.bgcolor = self.current_condition.color
             self.weather_container.bgcolor = ft.Colors.BLUE_50
         else:
             self.page.bgcolor = None 
@@ -519,35 +633,23 @@ class WeatherApp:
             self.page.theme_mode = ft.ThemeMode.LIGHT
             self.theme_button.icon = ft.Icons.DARK_MODE
 
-        if self.weather_container.visible:
+        if self.weather_container is not None and self.weather_container.visible:
             self.page.run_task(self.update_display)
         else:
             self.page.update()
 
-    def load_history(self):
-        if self.history_file.exists():
-            try:
-                with open(self.history_file, "r") as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
-
-    def save_history(self):
-        with open(self.history_file, "w") as f:
-            json.dump(self.search_history, f)
-
-    def add_to_history(self, city: str):
-        city = city.strip().title()
-        if city in self.search_history:
-             self.search_history.remove(city)
-        
-        self.search_history.insert(0, city)
-        self.search_history = self.search_history[:10]
-        self.save_history()
+    def add_to_history(self, city: str, weather_data: dict, forecast_data: dict):
+        # The store saves to disk on a background thread shortly afterwards
+        self.history.record(
+            city,
+            city_id=weather_data.get("id"),
+            payload={"weather": weather_data, "forecast": forecast_data, "fetched_at": time.time()},
+        )
 
     def update_history_dropdown(self):
-        self.history_dropdown.options = [ft.dropdown.Option(c) for c in self.search_history]
+        self.history_dropdown.options = [
+            ft.dropdown.Option(c) for c in self.history.cities(HISTORY_DROPDOWN_SIZE)
+        ]
         self.page.update()
 
 
@@ -556,4 +658,4 @@ def main(page: ft.Page):
 
 
 if __name__ == "__main__":
-    ft.app(target=main)
+    ft.app(target=main, assets_dir=str(ASSETS_DIR))
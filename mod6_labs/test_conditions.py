@@ -0,0 +1,80 @@
+# test_conditions.py
+"""Simple tests for the weather condition classifier."""
+
+from conditions import (
+    CLEAR, CLOUDS, CONDITIONS_BY_CODE, FOG, RAIN, SEVERE, SNOW, THUNDERSTORM,
+    TORNADO, UNKNOWN, classify, classify_weather,
+)
+
+
+def test_condition_codes():
+    """Test that each OpenWeatherMap code group maps to the right condition."""
+    expected = {200: THUNDERSTORM, 501: RAIN, 601: SNOW, 741: FOG, 781: TORNADO, 800: CLEAR, 804: CLOUDS}
+    wrong = {code: classify(code) for code, condition in expected.items() if classify(code) != condition}
+    if not wrong and len(CONDITIONS_BY_CODE) >= 55:
+        print("✅ Condition codes classified by group")
+        return True
+    print(f"❌ Misclassified codes: {wrong}")
+    return False
+
+
+def test_thunder_before_rain():
+    """Test that a thunderstorm with rain is a thunderstorm, by code and by text."""
+    by_code = classify_weather({"weather": [{"id": 201, "description": "thunderstorm with rain"}]})
+    by_text = classify(description="Thunderstorm With Light Rain")
+    if by_code.icon == "⛈" and by_text == THUNDERSTORM:
+        print("✅ Thunderstorm with rain shown as a thunderstorm")
+        return True
+    print(f"❌ Got {by_code} / {by_text}")
+    return False
+
+
+def test_text_fallback():
+    """Test the description fallback for missing or unknown codes."""
+    cases = {
+        "broken clouds": CLOUDS,
+        "light rain": RAIN,
+        "light snow": SNOW,
+        "haze": FOG,
+        "clear sky": CLEAR,
+        "something new": UNKNOWN,
+        "": UNKNOWN,
+    }
+    wrong = {text: classify(999, text) for text, condition in cases.items() if classify(999, text) != condition}
+    if not wrong:
+        print("✅ Descriptions classified when the code is unknown")
+        return True
+    print(f"❌ Misclassified descriptions: {wrong}")
+    return False
+
+
+def test_severity():
+    """Test that dangerous conditions are flagged as severe."""
+    severe = [code for code in (202, 212, 771, 781) if classify(code).severity >= SEVERE]
+    calm = [code for code in (800, 801, 500) if classify(code).severity >= SEVERE]
+    if len(severe) == 4 and not calm:
+        print("✅ Severe conditions flagged")
+        return True
+    print(f"❌ Severity wrong: severe={severe} calm={calm}")
+    return False
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Condition Classifier Tests\n")
+    print("=" * 50)
+
+    results = []
+    results.append(test_condition_codes())
+    results.append(test_thunder_before_rain())
+    results.append(test_text_fallback())
+    results.append(test_severity())
+
+    print("\n" + "=" * 50)
+    passed = sum(results)
+    total = len(results)
+    print(f"\nTests Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,114 @@
+# test_history_store.py
+"""Simple tests for the search history store."""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from history_store import HALF_LIFE, HistoryStore
+
+
+def test_migrates_old_format():
+    """Test loading the old plain-list history file."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "search_history.json"
+        path.write_text(json.dumps(["Gapan", "Naga", "London"]))
+        store = HistoryStore(path, flush_delay=0)
+        store.close()
+        data = json.loads(path.read_text())
+        if store.cities() == ["Gapan", "Naga", "London"] and data["version"] == 2:
+            print("✅ Old history list migrated in order")
+            return True
+        print(f"❌ Unexpected migration result: {store.cities()}")
+        return False
+
+
+def test_frecency_ranking():
+    """Test that frequent searches outrank a single recent one, and old ones fade."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(Path(tmp) / "history.json", flush_delay=60)
+        now = time.time()
+        for i in range(5):
+            store.record("manila", now=now - 3600 + i)
+        store.record("tokyo", now=now)
+        store.record("paris", now=now - 10 * HALF_LIFE)
+        store.record("paris", now=now - 10 * HALF_LIFE + 1)
+        store.close()
+        if store.cities() == ["Manila", "Tokyo", "Paris"]:
+            print("✅ Cities ranked by frequency and recency")
+            return True
+        print(f"❌ Unexpected ranking: {store.cities()}")
+        return False
+
+
+def test_debounced_atomic_flush():
+    """Test that several searches become one write and that entries survive a reload."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.json"
+        store = HistoryStore(path, flush_delay=0.2)
+        payload = {"weather": {"id": 1701668, "name": "Manila"}, "fetched_at": 0}
+        for city in ("Manila", "Naga", "Buhi"):
+            store.record(city, city_id=1701668 if city == "Manila" else None, payload=payload)
+        written_early = path.exists()
+        time.sleep(0.5)
+        leftovers = [p.name for p in Path(tmp).iterdir() if p.name.endswith(".tmp")]
+        reloaded = HistoryStore(path)
+        entry = reloaded.get("manila")
+        if not written_early and not leftovers and len(reloaded) == 3 and entry["city_id"] == 1701668:
+            print("✅ History flushed once in the background and reloaded intact")
+            return True
+        print(f"❌ Flush problem: early={written_early} leftovers={leftovers} entry={entry}")
+        return False
+
+
+def test_corrupt_file_is_kept():
+    """Test that an unreadable history file is set aside instead of silently lost."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.json"
+        path.write_text('["Gapan", "Na')
+        store = HistoryStore(path)
+        backup = Path(tmp) / "history.json.corrupt"
+        if len(store) == 0 and backup.exists():
+            print("✅ Corrupt history moved to history.json.corrupt")
+            return True
+        print("❌ Corrupt history was not preserved")
+        return False
+
+
+def test_cap():
+    """Test that the store never grows past max_entries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(Path(tmp) / "history.json", max_entries=5, flush_delay=60)
+        store.record("Keep", now=time.time())
+        store.record("Keep", now=time.time())
+        for i in range(20):
+            store.record(f"City {i}", now=time.time() - 1000 + i)
+        store.close()
+        if len(store) == 5 and "Keep" in store.cities():
+            print("✅ History capped, frequent entry kept")
+            return True
+        print(f"❌ Cap not applied: {store.cities()}")
+        return False
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running History Store Tests\n")
+    print("=" * 50)
+
+    results = []
+    results.append(test_migrates_old_format())
+    results.append(test_frecency_ranking())
+    results.append(test_debounced_atomic_flush())
+    results.append(test_corrupt_file_is_kept())
+    results.append(test_cap())
+
+    print("\n" + "=" * 50)
+    passed = sum(results)
+    total = len(results)
+    print(f"\nTests Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -1,7 +1,7 @@
 """Weather API service layer."""
 
 import httpx
-from typing import Dict
+from typing import Dict, Optional
 from config import Config
 import json # Ensure json is imported for error handling
 
@@ -15,6 +15,7 @@ class WeatherService:
     """Service for fetching weather data from OpenWeatherMap API."""
     
     def __init__(self):
+        Config.validate()
         self.api_key = Config.API_KEY
         self.base_url = Config.BASE_URL
         self.timeout = Config.TIMEOUT
@@ -56,16 +57,21 @@ class WeatherService:
             )
 
     
-    async def get_weather(self, city: str) -> Dict:
+    def _location_params(self, city: str, city_id: Optional[int]) -> Dict:
+        """Query by OpenWeatherMap city ID when known, otherwise by name."""
+        location = {"id": city_id} if city_id else {"q": city}
+        return {
+            **location,
+            "appid": self.api_key,
+            "units": Config.API_UNITS,
+        }
+
+    async def get_weather(self, city: str, city_id: Optional[int] = None) -> Dict:
         """Fetch current weather data for a given city."""
         if not city:
             raise WeatherServiceError("City name cannot be empty")
         
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": Config.API_UNITS,
-        }
+        params = self._location_params(city, city_id)
         
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
@@ -86,7 +92,7 @@ class WeatherService:
                 raise
             raise WeatherServiceError(f"An unexpected error occurred during weather fetch: {str(e)}")
     
-    async def get_forecast(self, city: str) -> Dict:
+    async def get_forecast(self, city: str, city_id: Optional[int] = None) -> Dict:
         """Fetch 5-day forecast data for a given city."""
         if not city:
             raise WeatherServiceError("City name cannot be empty")
@@ -94,11 +100,7 @@ class WeatherService:
         # Build forecast URL (different endpoint)
         forecast_url = self.base_url.replace("/weather", "/forecast")
         
-        params = {
-            "q": city,
-            "appid": self.api_key,
-            "units": Config.API_UNITS,
-        }
+        params = self._location_params(city, city_id)
         
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
@@ -1,44 +1,286 @@
 # basic_calculator.py
 # CCCS 106 - Week 1 Lab Exercise
 # Simple Interactive Calculator
+#
+# Batch mode (no prompts):
+#   python basic_calculator.py --batch pairs.csv           # one "a,b" pair per line
+#   python basic_calculator.py --batch - < pairs.csv       # read pairs from stdin
+#   python basic_calculator.py --batch pairs.bin -o out.csv  # float64 a,b,a,b,... binary input
+# Results are written as CSV (a,b,sum,difference,product,quotient), or as float64
+# sum,difference,product,quotient records when the output file ends in .bin
+# (a NaN quotient there means division by zero).
+#
+# Number modes (interactive and batch):
+#   --mode float      fast binary floating point (default; 0.1 + 0.2 = 0.30000000000000004)
+#   --mode decimal    decimal arithmetic with --precision significant digits (0.1 + 0.2 = 0.3)
+#   --mode fraction   exact fractions, operands may be written as 1/3
+# Exact modes get slower as numbers grow, so operands are limited in digits and exponent.
+# A result too long to print (Python won't convert integers of more than about 4300
+# digits to text) is shown as "Result is too large" for that pair only.
 
-print("=" * 40)
-print("BASIC CALCULATOR")
-print("=" * 40)
+import argparse
+import array
+import math
+import sys
+from decimal import Decimal, InvalidOperation, localcontext
+from fractions import Fraction
 
-# Get user input
-print("Enter two numbers for calculation:")
 try:
-    num1 = float(input("First number: "))
-    num2 = float(input("Second number: "))
-    
-    # Perform calculations
-    addition = num1 + num2
-    subtraction = num1 - num2
-    multiplication = num1 * num2
-    
-    # Handle division by zero
-    if num2 != 0:
-        division = num1 / num2
-    else:
-        division = "Cannot divide by zero"
-    
-    # Display results
-    print("\n" + "=" * 40)
-    print("RESULTS:")
+    import numpy as np
+except ImportError:  # batch mode falls back to the array module
+    np = None
+
+DIVIDE_BY_ZERO = "Cannot divide by zero"
+RESULT_TOO_LARGE = "Result is too large"
+CHUNK_SIZE = 65536  # operand pairs processed at a time in batch mode
+
+MODES = ("float", "decimal", "fraction")
+DEFAULT_PRECISION = 28  # significant digits in decimal mode
+MAX_PRECISION = 10000
+MAX_OPERAND_DIGITS = 1000  # digits allowed in one operand (decimal/fraction modes)
+# largest |exponent| allowed, e.g. 1e3000; with MAX_OPERAND_DIGITS this keeps every
+# operand's exact fraction printable
+MAX_OPERAND_EXPONENT = 3000
+
+
+def parse_number(text, mode="float"):
+    """
+    Converts input text to a float, Decimal or Fraction. Raises ValueError for text
+    that isn't a number, or (in the exact modes) is too big to calculate with quickly:
+    Fraction("1e999999999") alone would build a billion-digit integer.
+    """
+    if mode == "float":
+        return float(text)
+    text = text.strip()
+    if mode == "fraction" and "/" in text:
+        numerator, _, denominator = text.partition("/")
+        denominator = parse_number(denominator, mode)
+        if denominator == 0:
+            raise ValueError(DIVIDE_BY_ZERO)
+        return parse_number(numerator, mode) / denominator
+    if len(text) > MAX_OPERAND_DIGITS + 20:
+        raise ValueError("Number has too many digits")
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Invalid number: {text!r}") from None
+    if not value.is_finite():
+        raise ValueError("Numbers must be finite")
+    if value and abs(value.adjusted()) > MAX_OPERAND_EXPONENT:
+        raise ValueError("Number is too large")
+    return value if mode == "decimal" else Fraction(value)
+
+
+def format_number(value):
+    """str() of a result, or RESULT_TOO_LARGE for a fraction with too many digits to print."""
+    try:
+        return str(value)
+    except ValueError:
+        return RESULT_TOO_LARGE
+
+
+def run_interactive(mode="float", precision=DEFAULT_PRECISION):
     print("=" * 40)
-    print(f"{num1} + {num2} = {addition}")
-    print(f"{num1} - {num2} = {subtraction}")
-    print(f"{num1} * {num2} = {multiplication}")
-    print(f"{num1} / {num2} = {division}")
-    
-    # Additional information
-    print(f"\nLarger number: {max(num1, num2)}")
-    print(f"Smaller number: {min(num1, num2)}")
-    
-except ValueError:
-    print("Error: Please enter valid numbers only!")
-except Exception as e:
-    print(f"An error occurred: {e}")
-
-print("\nThank you for using Basic Calculator!")
\ No newline at end of file
+    print("BASIC CALCULATOR")
+    print("=" * 40)
+
+    # Get user input
+    print("Enter two numbers for calculation:")
+    try:
+        num1 = parse_number(input("First number: "), mode)
+        num2 = parse_number(input("Second number: "), mode)
+
+        # Perform calculations (precision only matters in decimal mode)
+        with localcontext() as ctx:
+            ctx.prec = precision
+            addition = num1 + num2
+            subtraction = num1 - num2
+            multiplication = num1 * num2
+
+            # Handle division by zero
+            if num2 != 0:
+                division = num1 / num2
+            else:
+                division = DIVIDE_BY_ZERO
+
+        # Display results
+        print("\n" + "=" * 40)
+        print("RESULTS:")
+        print("=" * 40)
+        print(f"{num1} + {num2} = {format_number(addition)}")
+        print(f"{num1} - {num2} = {format_number(subtraction)}")
+        print(f"{num1} * {num2} = {format_number(multiplication)}")
+        print(f"{num1} / {num2} = {format_number(division)}")
+
+        # Additional information
+        print(f"\nLarger number: {max(num1, num2)}")
+        print(f"Smaller number: {min(num1, num2)}")
+
+    except ValueError as e:
+        if mode == "float":
+            print("Error: Please enter valid numbers only!")
+        else:
+            print(f"Error: {e}")
+    except Exception as e:
+        print(f"An error occurred: {e}")
+
+    print("\nThank you for using Basic Calculator!")
+
+
+# ---------------------------------------------------------------- batch mode
+
+def read_text_chunks(stream, chunk_size=CHUNK_SIZE, mode="float"):
+    """
+    Yields (a, b) operand chunks from lines like "a,b" (or "a b"); bad lines are reported
+    and skipped. Floats come back as arrays, Decimals and Fractions as lists.
+    """
+    new_chunk = (lambda: array.array("d")) if mode == "float" else list
+    a, b = new_chunk(), new_chunk()
+    for line_no, line in enumerate(stream, start=1):
+        parts = line.replace(",", " ").split()
+        if not parts:
+            continue
+        try:
+            if len(parts) < 2:
+                raise ValueError("Please enter valid numbers only!")
+            x, y = parse_number(parts[0], mode), parse_number(parts[1], mode)
+        except ValueError as e:
+            if line_no > 1:  # the first line may be a header
+                reason = e if mode != "float" else "Please enter valid numbers only!"
+                print(f"Line {line_no}: Error: {reason}", file=sys.stderr)
+            continue
+        a.append(x)
+        b.append(y)
+        if len(a) >= chunk_size:
+            yield a, b
+            a, b = new_chunk(), new_chunk()
+    if a:
+        yield a, b
+
+
+def read_binary_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Yields (a, b) arrays from native float64 values stored as a0, b0, a1, b1, ..."""
+    record = 2 * array.array("d").itemsize
+    while True:
+        data = stream.read(chunk_size * record)
+        if not data:
+            break
+        values = array.array("d")
+        values.frombytes(data[:len(data) - len(data) % record])
+        yield values[0::2], values[1::2]
+
+
+def calculate_chunk(a, b):
+    """
+    Returns (sum, difference, product, quotient) sequences for the operand arrays.
+    Quotients are NaN where the divisor is zero.
+    """
+    if np is not None:
+        a = np.frombuffer(a, dtype=np.float64)
+        b = np.frombuffer(b, dtype=np.float64)
+        quotient = np.full_like(a, np.nan)
+        np.divide(a, b, out=quotient, where=b != 0)
+        return a + b, a - b, a * b, quotient
+    return (
+        array.array("d", map(float.__add__, a, b)),
+        array.array("d", map(float.__sub__, a, b)),
+        array.array("d", map(float.__mul__, a, b)),
+        array.array("d", (x / y if y != 0 else math.nan for x, y in zip(a, b))),
+    )
+
+
+def calculate_exact_chunk(a, b, precision=DEFAULT_PRECISION):
+    """Like calculate_chunk for lists of Decimals or Fractions; quotients are None where the divisor is zero."""
+    with localcontext() as ctx:
+        ctx.prec = precision
+        return (
+            [x + y for x, y in zip(a, b)],
+            [x - y for x, y in zip(a, b)],
+            [x * y for x, y in zip(a, b)],
+            [x / y if y != 0 else None for x, y in zip(a, b)],
+        )
+
+
+def write_text_chunk(out, a, b, results):
+    """Writes one CSV row per pair, using the interactive mode's divide-by-zero message."""
+    if isinstance(results[0], list):
+        # exact results: a fraction too long to print gets an error cell, not a crash
+        results = [[format_number(v) for v in r] for r in results]
+    sums, diffs, prods, quots = (r if isinstance(r, list) else r.tolist() for r in results)
+    zero = [y == 0 for y in b]
+    out.write("".join(
+        f"{x},{y},{s},{d},{p},{DIVIDE_BY_ZERO if z else q}\n"
+        for x, y, s, d, p, q, z in zip(a, b, sums, diffs, prods, quots, zero)
+    ))
+
+
+def write_binary_chunk(out, a, b, results):
+    """Writes float64 sum, difference, product, quotient records."""
+    if np is not None:
+        out.write(np.column_stack(results).tobytes())
+    else:
+        out.write(array.array("d", (v for row in zip(*results) for v in row)).tobytes())
+
+
+def run_batch(source, output=None, binary_input=None, mode="float", precision=DEFAULT_PRECISION):
+    """Streams operand pairs from source (a path or "-") through the four operations."""
+    if binary_input is None:
+        binary_input = source.endswith(".bin")
+    binary_output = bool(output and output.endswith(".bin"))
+    if mode != "float" and (binary_input or binary_output):
+        raise ValueError(f"{mode} mode only works with text input and output")
+
+    if source == "-":
+        infile = sys.stdin.buffer if binary_input else sys.stdin
+    else:
+        infile = open(source, "rb" if binary_input else "r")
+    if output:
+        outfile = open(output, "wb" if binary_output else "w")
+    else:
+        outfile = sys.stdout.buffer if binary_output else sys.stdout
+
+    count = 0
+    try:
+        if not binary_output:
+            outfile.write("a,b,sum,difference,product,quotient\n")
+        if binary_input:
+            chunks = read_binary_chunks(infile)
+        else:
+            chunks = read_text_chunks(infile, mode=mode)
+        write = write_binary_chunk if binary_output else write_text_chunk
+        for a, b in chunks:
+            if mode == "float":
+                results = calculate_chunk(a, b)
+            else:
+                results = calculate_exact_chunk(a, b, precision)
+            write(outfile, a, b, results)
+            count += len(a)
+    finally:
+        if infile not in (sys.stdin, sys.stdin.buffer):
+            infile.close()
+        if outfile not in (sys.stdout, sys.stdout.buffer):
+            outfile.close()
+    print(f"Processed {count} pairs", file=sys.stderr)
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Basic Calculator")
+    parser.add_argument("--batch", metavar="FILE", help='operand pairs file, or "-" for stdin')
+    parser.add_argument("-o", "--output", help="results file (default: stdout; .bin for binary)")
+    parser.add_argument("--binary", action="store_true", help="treat the input as float64 pairs")
+    parser.add_argument("--mode", choices=MODES, default="float", help="number type (default: float)")
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION,
+                        help=f"significant digits in decimal mode (default: {DEFAULT_PRECISION})")
+    args = parser.parse_args()
+    if not 1 <= args.precision <= MAX_PRECISION:
+        parser.error(f"--precision must be between 1 and {MAX_PRECISION}")
+
+    if args.batch:
+        try:
+            run_batch(args.batch, args.output, binary_input=True if args.binary else None,
+                      mode=args.mode, precision=args.precision)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        run_interactive(args.mode, args.precision)
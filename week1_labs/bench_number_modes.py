@@ -0,0 +1,53 @@
+# bench_number_modes.py
+# CCCS 106 - Week 1 Lab Exercise
+# Compares float, decimal and fraction throughput of the calculator's batch mode
+#
+#   python bench_number_modes.py --pairs 200000
+
+import argparse
+import io
+import random
+import time
+
+import basic_calculator
+from basic_calculator import DEFAULT_PRECISION, MODES
+
+
+def make_pairs(count, seed=42):
+    """CSV text of count operand pairs with a few decimal places (and some zero divisors)."""
+    rng = random.Random(seed)
+    lines = ["a,b"]
+    for _ in range(count):
+        b = 0 if rng.random() < 0.01 else round(rng.uniform(-100, 100), 2)
+        lines.append(f"{rng.uniform(-10000, 10000):.4f},{b}")
+    return "\n".join(lines) + "\n"
+
+
+def bench_mode(data, mode, precision):
+    """Runs the batch pipeline over in-memory CSV data; returns (pairs, seconds)."""
+    source = io.StringIO(data)
+    sink = io.StringIO()
+    start = time.perf_counter()
+    chunks = basic_calculator.read_text_chunks(source, mode=mode)
+    count = 0
+    for a, b in chunks:
+        if mode == "float":
+            results = basic_calculator.calculate_chunk(a, b)
+        else:
+            results = basic_calculator.calculate_exact_chunk(a, b, precision)
+        basic_calculator.write_text_chunk(sink, a, b, results)
+        count += len(a)
+    return count, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark calculator number modes")
+    parser.add_argument("--pairs", type=int, default=200_000)
+    parser.add_argument("--precision", type=int, default=DEFAULT_PRECISION)
+    args = parser.parse_args()
+
+    data = make_pairs(args.pairs)
+    print(f"{'mode':<10}{'pairs/s':>14}{'seconds':>10}")
+    for mode in MODES:
+        count, seconds = bench_mode(data, mode, args.precision)
+        print(f"{mode:<10}{count / seconds:>14,.0f}{seconds:>10.3f}")
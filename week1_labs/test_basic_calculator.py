@@ -0,0 +1,43 @@
+# test_basic_calculator.py
+"""Simple tests for the basic calculator's batch mode."""
+
+import tempfile
+from pathlib import Path
+
+from basic_calculator import RESULT_TOO_LARGE, run_batch
+
+
+def test_oversized_row_between_valid_rows():
+    """Test that a result too long to print only affects its own row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "pairs.csv"
+        output = Path(tmp) / "results.csv"
+        source.write_text("1,2\n1e5000,1\n1e3000,1e-3000\n3,4\n")
+        count = run_batch(str(source), str(output), mode="fraction")
+        rows = output.read_text().splitlines()
+    if (count == 3 and len(rows) == 4
+            and rows[1] == "1,2,3,-1,2,1/2"
+            and RESULT_TOO_LARGE in rows[2]
+            and rows[3] == "3,4,7,-1,12,3/4"):
+        print("✅ Oversized row reported, valid rows still calculated")
+        return True
+    print(f"❌ Unexpected batch output: {count} pairs, {[row[:40] for row in rows]}")
+    return False
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Basic Calculator Tests\n")
+    print("=" * 50)
+
+    results = []
+    results.append(test_oversized_row_between_valid_rows())
+
+    print("\n" + "=" * 50)
+    passed = sum(results)
+    total = len(results)
+    print(f"\nTests Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,92 @@
+# bench_calc_engine.py
+# CCCS 106 - Week 2 Lab Exercise
+# Throughput benchmarks for calc_engine
+#
+#   python bench_calc_engine.py --rows 100000
+
+import argparse
+import json
+import random
+import time
+
+import calc_engine
+from calc_engine import MODES, compile_expression, evaluate, evaluate_many
+
+EXPRESSIONS = (
+    "1 + 2 * 3",
+    "a + b",
+    "a / b",
+    "(a - b) ** 2 / (abs(a) + 1)",
+    "sqrt(a * a + b * b) * pi",
+)
+
+
+def _rate(count, seconds):
+    return round(count / seconds) if seconds else None
+
+
+def bench_compile(repeat):
+    """Expressions compiled per second, with the LRU cache cleared each time vs. cache hits."""
+    texts = [f"{expr} + {i}" for i in range(repeat) for expr in EXPRESSIONS]
+    compile_expression.cache_clear()
+    start = time.perf_counter()
+    for text in texts:
+        compile_expression(text)
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for expr in EXPRESSIONS:
+            compile_expression(expr)
+    warm = time.perf_counter() - start
+    return {"cold_per_s": _rate(len(texts), cold), "cached_per_s": _rate(repeat * len(EXPRESSIONS), warm)}
+
+
+def bench_evaluate(rows):
+    """Single evaluations (cache lookup + evaluation) vs. one batch over all rows, per expression."""
+    rng = random.Random(42)
+    data = [{"a": rng.uniform(-1000, 1000), "b": rng.choice((0, rng.uniform(-10, 10)))} for _ in range(rows)]
+    results = {}
+    for expr in EXPRESSIONS:
+        start = time.perf_counter()
+        for row in data:
+            try:
+                evaluate(expr, row)
+            except calc_engine.CalculatorError:
+                pass
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in evaluate_many(expr, data, errors="message"):
+            pass
+        batch = time.perf_counter() - start
+        results[expr] = {"single_per_s": _rate(rows, single), "batch_per_s": _rate(rows, batch)}
+    return results
+
+
+def bench_modes(rows):
+    """Batch throughput of the same workload in float, decimal and fraction mode."""
+    rng = random.Random(7)
+    data = [(f"{rng.uniform(-1000, 1000):.4f}", f"{rng.uniform(1, 100):.2f}") for _ in range(rows)]
+    results = {}
+    for mode in MODES:
+        start = time.perf_counter()
+        for _ in evaluate_many("(a + b) * a / b - a", data, errors="message", mode=mode):
+            pass
+        results[mode] = {"batch_per_s": _rate(rows, time.perf_counter() - start)}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the calculator engine")
+    parser.add_argument("--rows", type=int, default=100_000, help="variable bindings per batch")
+    parser.add_argument("--repeat", type=int, default=2_000, help="compilations per expression")
+    args = parser.parse_args()
+
+    report = {
+        "compile": bench_compile(args.repeat),
+        "evaluate": bench_evaluate(args.rows),
+        "modes": bench_modes(args.rows),
+        "cache": calc_engine.cache_info()._asdict(),
+    }
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,377 @@
+# calc_engine.py
+# CCCS 106 - Week 2 Lab Exercise
+# Calculator engine: safe arithmetic expression evaluation
+#
+#   from calc_engine import evaluate, compile_expression, evaluate_many
+#   evaluate("2 * (3 + 4)")                        # 14.0
+#   evaluate("0.1 + 0.2", mode="decimal")          # Decimal('0.3')
+#   evaluate("1/3 + 1/6", mode="fraction")         # Fraction(1, 2)
+#   area = compile_expression("pi * r ** 2")
+#   area(r=2)                                      # 12.566...
+#   list(evaluate_many("a / b", [{"a": 1, "b": 2}, {"a": 1, "b": 0}], errors="message"))
+#
+# Expressions are parsed with the ast module and only whitelisted nodes (numbers,
+# variables, + - * / // % **, unary +/-, and a few math functions) are accepted,
+# so nothing is ever passed to eval(). Each expression is compiled once into a tree
+# of closures and kept in an LRU cache keyed by its text, mode and precision.
+#
+# The decimal and fraction modes are exact (or as precise as asked for), so their
+# cost grows with the size of the numbers. Operands, powers, round() digits and
+# intermediate fractions are therefore capped in size, and since expressions are
+# capped in length too, no single evaluation can run away with the CPU.
+
+import ast
+import math
+import operator
+import sys
+from decimal import (
+    Decimal, DivisionByZero, DivisionImpossible, DivisionUndefined, InvalidOperation, Overflow, localcontext,
+)
+from fractions import Fraction
+from functools import lru_cache
+
+DIVIDE_BY_ZERO = "Cannot divide by zero"
+CACHE_SIZE = 512  # compiled expressions kept in the LRU cache
+MAX_EXPRESSION_LENGTH = 1000
+
+MODES = ("float", "decimal", "fraction")
+DEFAULT_PRECISION = 28  # significant digits in decimal mode
+MAX_PRECISION = 10_000
+MAX_OPERAND_DIGITS = 1000  # digits allowed in one number (decimal/fraction modes)
+MAX_OPERAND_EXPONENT = 3000  # largest |exponent| allowed in scientific notation
+# Size cap for fraction numerators/denominators. Python refuses to convert integers of
+# more than sys.get_int_max_str_digits() digits (4300 by default) to text, so larger
+# results could be computed but never shown.
+MAX_RESULT_BITS = int((sys.get_int_max_str_digits() or 30_000) * math.log2(10))
+MAX_ROUND_DIGITS = 1000  # largest |ndigits| accepted by round()
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+
+def _round(value, ndigits=None):
+    if ndigits is None:
+        return round(value)
+    if ndigits != int(ndigits):
+        raise CalculatorError("round() needs a whole number of digits")
+    if abs(ndigits) > MAX_ROUND_DIGITS:
+        raise CalculatorError(f"round() accepts at most {MAX_ROUND_DIGITS} digits")
+    try:
+        return round(value, int(ndigits))
+    except InvalidOperation:
+        # a Decimal with more digits before the point than the precision allows
+        raise CalculatorError("Number is too large") from None
+
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": _round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+
+DECIMAL_FUNCTIONS = {
+    "abs": abs,
+    "round": _round,
+    "min": min,
+    "max": max,
+    "sqrt": Decimal.sqrt,
+    "exp": Decimal.exp,
+    "log": Decimal.ln,
+    "log10": Decimal.log10,
+}
+
+FRACTION_FUNCTIONS = {
+    "abs": abs,
+    "round": _round,
+    "min": min,
+    "max": max,
+}
+
+
+class CalculatorError(ValueError):
+    """Raised for expressions that can't be parsed or evaluated."""
+
+
+def parse_exact(text, mode):
+    """
+    Converts number text to a Decimal or Fraction without going through float, so
+    "0.1" stays exactly 0.1. Fraction mode also accepts "1/3". Numbers with too many
+    digits or too large an exponent are rejected before any arithmetic is done.
+    """
+    text = str(text).strip()
+    if mode == "fraction" and "/" in text:
+        numerator, _, denominator = text.partition("/")
+        denominator = parse_exact(denominator, mode)
+        if denominator == 0:
+            raise CalculatorError(DIVIDE_BY_ZERO)
+        return parse_exact(numerator, mode) / denominator
+    if len(text) > MAX_OPERAND_DIGITS + 20:
+        raise CalculatorError("Number has too many digits")
+    try:
+        value = Decimal(text)
+    except InvalidOperation:
+        raise CalculatorError(f"Invalid number: {text!r}") from None
+    if not value.is_finite():
+        raise CalculatorError("Numbers must be finite")
+    if value and abs(value.adjusted()) > MAX_OPERAND_EXPONENT:
+        raise CalculatorError("Number is too large")
+    return value if mode == "decimal" else Fraction(value)
+
+
+def _check_fraction(value):
+    if isinstance(value, Fraction) and max(
+        value.numerator.bit_length(), value.denominator.bit_length()
+    ) > MAX_RESULT_BITS:
+        raise CalculatorError("Result is too large")
+    return value
+
+
+def _divide(a, b):
+    if b == 0:
+        raise CalculatorError(DIVIDE_BY_ZERO)
+    return a / b
+
+
+def _floor_divide(a, b):
+    if b == 0:
+        raise CalculatorError(DIVIDE_BY_ZERO)
+    return a // b
+
+
+def _modulo(a, b):
+    if b == 0:
+        raise CalculatorError(DIVIDE_BY_ZERO)
+    return a % b
+
+
+def _power(a, b):
+    if isinstance(a, Fraction):
+        # exact powers grow linearly with the exponent, so check the size up front
+        if b.denominator != 1:
+            raise CalculatorError("Fraction mode only supports whole-number exponents")
+        # (size - 1) * |b| is a lower bound, so nothing printable is refused; a result a
+        # little over the cap is caught by _check_fraction afterwards
+        size = max(a.numerator.bit_length(), a.denominator.bit_length())
+        if size > 1 and abs(b) * (size - 1) > MAX_RESULT_BITS:
+            raise CalculatorError("Result is too large")
+    try:
+        return a ** b
+    except OverflowError:
+        raise CalculatorError("Result is too large") from None
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: _divide,
+    ast.FloorDiv: _floor_divide,
+    ast.Mod: _modulo,
+    ast.Pow: _power,
+}
+
+UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _error_message(error):
+    # decimal raises e.g. InvalidOperation([<class 'decimal.DivisionImpossible'>]) with the
+    # signals that fired as its argument; use the float-mode wording instead
+    signals = error.args[0] if error.args and isinstance(error.args[0], list) else [type(error)]
+
+    def fired(*kinds):
+        return isinstance(error, kinds) or any(issubclass(signal, kinds) for signal in signals)
+
+    if fired(OverflowError, Overflow, DivisionImpossible):
+        return "Result is too large"
+    if fired(DivisionByZero, DivisionUndefined):
+        return DIVIDE_BY_ZERO
+    if fired(InvalidOperation):
+        return "math domain error"
+    return str(error) or type(error).__name__
+
+
+class CompiledExpression:
+    """
+    An expression compiled to closures. Call it with variable values as keyword
+    arguments (or a mapping via evaluate) to get the result as a float, Decimal or
+    Fraction depending on the mode.
+    """
+
+    __slots__ = ("text", "variables", "mode", "precision", "_func", "_convert")
+
+    def __init__(self, text, variables, func, mode="float", precision=DEFAULT_PRECISION):
+        self.text = text
+        self.variables = variables  # sorted tuple of variable names
+        self.mode = mode
+        self.precision = precision
+        self._func = func
+        self._convert = float if mode == "float" else lambda value: parse_exact(value, mode)
+
+    def evaluate(self, bindings=None):
+        env = {}
+        if bindings:
+            try:
+                env = {name: self._convert(bindings[name]) for name in self.variables}
+            except KeyError as e:
+                raise CalculatorError(f"No value for variable {e.args[0]!r}") from None
+            except (TypeError, ValueError) as e:
+                if isinstance(e, CalculatorError):
+                    raise
+                raise CalculatorError("Variables must be numbers") from None
+        elif self.variables:
+            raise CalculatorError(f"No value for variable {self.variables[0]!r}")
+        try:
+            if self.mode == "float":
+                return float(self._func(env))
+            with localcontext() as ctx:
+                ctx.prec = self.precision
+                return self._func(env)
+        except (ArithmeticError, ValueError, TypeError) as e:
+            if isinstance(e, CalculatorError):
+                raise
+            raise CalculatorError(_error_message(e)) from None
+
+    def __call__(self, **bindings):
+        return self.evaluate(bindings)
+
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r}, mode={self.mode!r})"
+
+
+def _compile_node(node, variables, source, mode):
+    """Returns a closure env -> value for an AST node, rejecting anything not whitelisted."""
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise CalculatorError(f"Unsupported value: {node.value!r}")
+        if mode == "float":
+            try:
+                value = float(node.value)
+            except OverflowError:
+                raise CalculatorError("Number is too large") from None
+        else:
+            value = parse_exact(ast.get_source_segment(source, node), mode)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            if mode != "float":
+                value = parse_exact(repr(value), mode)
+            return lambda env: value
+        variables.add(name)
+        return lambda env: env[name]
+
+    if isinstance(node, ast.BinOp):
+        op = BINARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise CalculatorError(f"Unsupported operator: {type(node.op).__name__}")
+        left = _compile_node(node.left, variables, source, mode)
+        right = _compile_node(node.right, variables, source, mode)
+        if mode == "fraction":
+            return lambda env: _check_fraction(op(left(env), right(env)))
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp):
+        op = UNARY_OPERATORS.get(type(node.op))
+        if op is None:
+            raise CalculatorError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, variables, source, mode)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Call):
+        functions = {"float": FUNCTIONS, "decimal": DECIMAL_FUNCTIONS, "fraction": FRACTION_FUNCTIONS}[mode]
+        if not isinstance(node.func, ast.Name) or node.keywords:
+            raise CalculatorError("Unsupported function call")
+        func = functions.get(node.func.id)
+        if func is None:
+            if node.func.id in FUNCTIONS:
+                raise CalculatorError(f"{node.func.id}() is not available in {mode} mode")
+            raise CalculatorError("Unsupported function call")
+        args = tuple(_compile_node(arg, variables, source, mode) for arg in node.args)
+        if mode == "fraction":
+            return lambda env: _check_fraction(func(*(arg(env) for arg in args)))
+        if len(args) == 1:
+            arg = args[0]
+            return lambda env: func(arg(env))
+        return lambda env: func(*(arg(env) for arg in args))
+
+    raise CalculatorError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def _fold_constants(func, variables, mode, precision):
+    # an expression without variables always gives the same result, so compute it once
+    if variables:
+        return func
+    try:
+        with localcontext() as ctx:
+            ctx.prec = precision
+            value = func({})
+    except (ArithmeticError, ValueError, TypeError):
+        return func  # let the error surface at evaluation time
+    return lambda env: value
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text, mode="float", precision=DEFAULT_PRECISION):
+    """Parses and compiles an expression. Results are cached by (text, mode, precision)."""
+    if mode not in MODES:
+        raise CalculatorError(f"Unknown mode {mode!r}, expected one of {', '.join(MODES)}")
+    if not 1 <= precision <= MAX_PRECISION:
+        raise CalculatorError(f"Precision must be between 1 and {MAX_PRECISION}")
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise CalculatorError("Expression is too long")
+    source = text.strip()
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError:
+        raise CalculatorError(f"Invalid expression: {text!r}") from None
+    variables = set()
+    func = _compile_node(tree.body, variables, source, mode)
+    return CompiledExpression(
+        text, tuple(sorted(variables)), _fold_constants(func, variables, mode, precision), mode, precision
+    )
+
+
+def evaluate(text, bindings=None, mode="float", precision=DEFAULT_PRECISION, **variables):
+    """Evaluates an expression once, e.g. evaluate("x * 2", x=4)."""
+    if variables:
+        bindings = {**(bindings or {}), **variables}
+    return compile_expression(text, mode, precision).evaluate(bindings)
+
+
+def evaluate_many(text, rows, errors="raise", mode="float", precision=DEFAULT_PRECISION):
+    """
+    Evaluates one expression for each row of variable values and yields the results
+    in order. A row is a mapping of names to values, or a sequence of values in the
+    order of compile_expression(text).variables.
+    With errors="message", a row that fails yields the error message (for example
+    "Cannot divide by zero") instead of stopping the batch.
+    """
+    compiled = compile_expression(text, mode, precision)
+    names = compiled.variables
+    evaluate_row = compiled.evaluate
+    for row in rows:
+        if not isinstance(row, dict):
+            row = dict(zip(names, row))
+        try:
+            yield evaluate_row(row)
+        except CalculatorError as e:
+            if errors != "message":
+                raise
+            yield str(e)
+
+
+def cache_info():
+    """Hit/miss statistics for the compiled-expression cache."""
+    return compile_expression.cache_info()
@@ -1 +1,329 @@
-# Enhanced Calculator - Coming Soon 
+# enhanced_calculator.py
+# CCCS 106 - Week 2 Lab Exercise
+# Enhanced Calculator GUI
+#
+# Expressions are evaluated by calc_engine in a separate worker process, so a slow
+# calculation (a huge power, a long expression) never freezes the window and can be
+# cancelled. Results are kept in a bounded history list. The Mode dropdown switches
+# between float, decimal (with a chosen precision) and exact fraction arithmetic.
+
+import asyncio
+import multiprocessing
+from collections import deque
+
+import flet as ft
+
+from calc_engine import DEFAULT_PRECISION, MAX_PRECISION, CalculatorError, evaluate
+
+HISTORY_SIZE = 500  # results kept in the history list
+EVAL_TIMEOUT = 30.0  # seconds before a calculation is cancelled automatically
+HISTORY_ITEM_HEIGHT = 48
+
+
+def format_result(result):
+    """Result text for the display; raises CalculatorError if it can't be converted."""
+    try:
+        return str(result)
+    except ValueError:
+        # more digits than Python will convert to text (sys.get_int_max_str_digits)
+        raise CalculatorError("Result is too large") from None
+
+
+def _evaluate_in_worker(expression, mode, precision):
+    # runs in the worker process
+    return evaluate(expression, mode=mode, precision=precision)
+
+
+class Evaluator:
+    """
+    Runs calculations in a single-process multiprocessing pool. A running calculation
+    can't be interrupted inside the worker, so cancel() terminates the pool and a new
+    one is started on the next evaluation.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._pending = set()
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(processes=1)
+        return self._pool
+
+    async def evaluate(self, expression, mode="float", precision=DEFAULT_PRECISION, timeout=EVAL_TIMEOUT):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(result=None, error=None):
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        self._pending.add(future)
+        self._get_pool().apply_async(
+            _evaluate_in_worker,
+            (expression, mode, precision),
+            callback=lambda result: loop.call_soon_threadsafe(resolve, result),
+            error_callback=lambda error: loop.call_soon_threadsafe(resolve, None, error),
+        )
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            self.cancel()
+            raise
+        finally:
+            self._pending.discard(future)
+
+    def cancel(self):
+        """Stops whatever is running and fails the pending calculations with CancelledError."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+
+    def close(self):
+        self.cancel()
+
+
+def main(page: ft.Page):
+    # Page configuration
+    page.title = "CCCS 106 - Enhanced Calculator"
+    page.window.width = 420
+    page.window.height = 720
+    page.padding = 20
+    page.theme_mode = ft.ThemeMode.LIGHT
+
+    evaluator = Evaluator()
+    history = deque(maxlen=HISTORY_SIZE)
+
+    # Title with styling
+    title = ft.Text(
+        "Enhanced Calculator",
+        size=24,
+        weight=ft.FontWeight.BOLD,
+        text_align=ft.TextAlign.CENTER,
+        color=ft.Colors.BLUE_700
+    )
+
+    # Expression input
+    expression_input = ft.TextField(
+        label="Expression (e.g. 2 ** 10 / (3 + 4))",
+        width=360,
+        border_color=ft.Colors.BLUE_300,
+        autofocus=True,
+    )
+
+    # Number mode
+    mode_dropdown = ft.Dropdown(
+        label="Mode",
+        width=170,
+        value="float",
+        options=[
+            ft.dropdown.Option("float", "Float"),
+            ft.dropdown.Option("decimal", "Decimal"),
+            ft.dropdown.Option("fraction", "Fraction"),
+        ]
+    )
+    precision_input = ft.TextField(
+        label="Precision",
+        width=120,
+        value=str(DEFAULT_PRECISION),
+        keyboard_type=ft.KeyboardType.NUMBER
+    )
+
+    # Result display
+    result_text = ft.Text(
+        "",
+        size=20,
+        weight=ft.FontWeight.BOLD,
+        text_align=ft.TextAlign.CENTER,
+        color=ft.Colors.GREEN_700,
+        selectable=True,
+    )
+    progress = ft.ProgressRing(width=20, height=20, stroke_width=2, visible=False)
+
+    # History list; fixed item height lets the list lay out only the rows on screen
+    history_view = ft.ListView(
+        item_extent=HISTORY_ITEM_HEIGHT,
+        height=220,
+        spacing=0,
+    )
+
+    # Button functions
+    def append_text(text):
+        expression_input.value = (expression_input.value or "") + text
+        page.update()
+
+    def use_history_item(e):
+        expression_input.value = e.control.data
+        page.update()
+
+    def add_to_history(expression, result):
+        history.appendleft((expression, result))
+        history_view.controls.insert(0, ft.ListTile(
+            title=ft.Text(f"{expression} = {result}", size=14, no_wrap=True),
+            dense=True,
+            data=expression,
+            on_click=use_history_item,
+        ))
+        if len(history_view.controls) > HISTORY_SIZE:
+            history_view.controls.pop()
+
+    def set_busy(busy):
+        progress.visible = busy
+        cancel_button.visible = busy
+        equals_button.disabled = busy
+        expression_input.disabled = busy
+
+    async def calculate(e):
+        expression = (expression_input.value or "").strip()
+        if not expression:
+            result_text.value = "Please enter an expression first!"
+            result_text.color = ft.Colors.RED_700
+            page.update()
+            return
+
+        try:
+            precision = int(precision_input.value)
+            if not 1 <= precision <= MAX_PRECISION:
+                raise ValueError
+        except (TypeError, ValueError):
+            result_text.value = f"Precision must be a whole number from 1 to {MAX_PRECISION}"
+            result_text.color = ft.Colors.RED_700
+            page.update()
+            return
+
+        set_busy(True)
+        result_text.value = "Calculating..."
+        result_text.color = ft.Colors.GREY_700
+        page.update()
+        try:
+            result = await evaluator.evaluate(expression, mode_dropdown.value, precision)
+            result = format_result(result)
+        except CalculatorError as error:
+            result_text.value = f"Error: {error}"
+            result_text.color = ft.Colors.RED_700
+        except asyncio.TimeoutError:
+            result_text.value = "Calculation took too long and was stopped"
+            result_text.color = ft.Colors.RED_700
+        except asyncio.CancelledError:
+            result_text.value = "Calculation cancelled"
+            result_text.color = ft.Colors.ORANGE_700
+        except Exception:
+            # anything else from the worker (a crash, a pickling error, a broken pool)
+            result_text.value = "Error"
+            result_text.color = ft.Colors.RED_700
+        else:
+            result_text.value = f"= {result}"
+            result_text.color = ft.Colors.GREEN_700
+            add_to_history(expression, result)
+        finally:
+            set_busy(False)
+            page.update()
+
+    def cancel_calculation(e):
+        evaluator.cancel()
+
+    def clear_all(e):
+        expression_input.value = ""
+        result_text.value = ""
+        page.update()
+
+    def clear_history(e):
+        history.clear()
+        history_view.controls.clear()
+        page.update()
+
+    expression_input.on_submit = calculate
+
+    # Keypad
+    keypad_rows = [
+        ["7", "8", "9", "/"],
+        ["4", "5", "6", "*"],
+        ["1", "2", "3", "-"],
+        ["0", ".", "**", "+"],
+        ["(", ")", "sqrt(", "%"],
+    ]
+    keypad = ft.Column([
+        ft.Row(
+            [
+                ft.ElevatedButton(
+                    key,
+                    on_click=lambda e, key=key: append_text(key),
+                    width=80,
+                )
+                for key in row
+            ],
+            alignment=ft.MainAxisAlignment.CENTER,
+            spacing=8
+        )
+        for row in keypad_rows
+    ], spacing=8)
+
+    # Buttons with styling
+    equals_button = ft.ElevatedButton(
+        "=",
+        on_click=calculate,
+        width=120,
+        bgcolor=ft.Colors.BLUE_600,
+        color=ft.Colors.WHITE
+    )
+
+    clear_button = ft.ElevatedButton(
+        "Clear",
+        on_click=clear_all,
+        width=120,
+        bgcolor=ft.Colors.GREY_600,
+        color=ft.Colors.WHITE
+    )
+
+    cancel_button = ft.ElevatedButton(
+        "Cancel",
+        on_click=cancel_calculation,
+        width=120,
+        bgcolor=ft.Colors.RED_600,
+        color=ft.Colors.WHITE,
+        visible=False
+    )
+
+    page.on_close = lambda e: evaluator.close()
+
+    # Layout using containers and columns
+    page.add(
+        ft.Container(
+            content=ft.Column([
+                title,
+                ft.Divider(height=10),
+                expression_input,
+                ft.Row([mode_dropdown, precision_input], alignment=ft.MainAxisAlignment.CENTER),
+                keypad,
+                ft.Row(
+                    [equals_button, clear_button, cancel_button],
+                    alignment=ft.MainAxisAlignment.CENTER,
+                    spacing=10
+                ),
+                ft.Row([progress, result_text], alignment=ft.MainAxisAlignment.CENTER),
+                ft.Divider(height=10),
+                ft.Row(
+                    [
+                        ft.Text("History", size=16, weight=ft.FontWeight.BOLD),
+                        ft.TextButton("Clear history", on_click=clear_history),
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN
+                ),
+                history_view,
+            ],
+            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
+            spacing=10),
+            padding=10
+        )
+    )
+
+# Run the application
+if __name__ == "__main__":
+    ft.app(target=main)
@@ -1,9 +1,18 @@
 # personal_info_gui.py
 # CCCS 106 - Week 2 Lab Exercise
 # Enhanced Personal Information with GUI
+#
+# Generated profiles are saved to profiles.db (see profile_store.py) and can be
+# browsed in the Saved Profiles panel, which loads one page at a time as you scroll.
 
 import flet as ft
 from datetime import datetime
+import threading
+
+from profile_rules import ProfileError, build_profile
+from profile_store import PAGE_SIZE, ProfileStore
+
+SAVED_ITEM_HEIGHT = 56
 
 def main(page: ft.Page):
     # Page configuration
@@ -13,6 +22,8 @@ def main(page: ft.Page):
     page.padding = 20
     page.scroll = ft.ScrollMode.AUTO
     
+    store = ProfileStore()
+    
     # Title
     title = ft.Text(
         "Personal Information Manager",
@@ -77,15 +88,20 @@ def main(page: ft.Page):
     # Functions
     def generate_profile(e):
         try:
-            # Validate inputs
-            if not all([first_name.value, last_name.value, age.value]):
-                show_error("Please fill in all required fields (Name and Age)!")
-                return
-            
-            # Calculate birth year
-            current_year = datetime.now().year
-            birth_year = current_year - int(age.value)
-            graduation_year = current_year + (4 - int(year_level.value[0]) if year_level.value else 4)
+            # Validate inputs and calculate birth/graduation years
+            profile = build_profile({
+                "first_name": first_name.value,
+                "last_name": last_name.value,
+                "age": age.value,
+                "student_id": student_id.value,
+                "program": program_dropdown.value,
+                "year_level": year_level.value,
+                "favorite_color": favorite_color.value,
+                "hobbies": hobbies.value,
+            })
+            store.upsert(profile)
+            birth_year = profile["birth_year"]
+            graduation_year = profile["graduation_year"]
             
             # Generate profile
             profile_content = ft.Column([
@@ -106,10 +122,10 @@ def main(page: ft.Page):
             ])
             
             output_container.content = profile_content
-            page.update()
+            search_profiles(None)
             
-        except ValueError:
-            show_error("Please enter a valid age (number only)!")
+        except ProfileError as ex:
+            show_error(str(ex))
         except Exception as ex:
             show_error(f"An error occurred: {str(ex)}")
     
@@ -139,6 +155,77 @@ def main(page: ft.Page):
         dialog.open = False
         page.update()
     
+    # Saved profiles panel
+    saved_search = ft.TextField(label="Search saved profiles (name or ID)", width=300)
+    saved_program = ft.Dropdown(
+        label="Program",
+        width=130,
+        options=[ft.dropdown.Option("", "All")] + [
+            ft.dropdown.Option(option.key) for option in program_dropdown.options
+        ]
+    )
+    saved_year = ft.Dropdown(
+        label="Year",
+        width=100,
+        options=[ft.dropdown.Option("", "All")] + [
+            ft.dropdown.Option(radio.value) for radio in year_level.content.controls
+        ]
+    )
+    saved_count = ft.Text("", size=12, color=ft.Colors.GREY_600)
+    saved_list = ft.ListView(
+        height=300,
+        item_extent=SAVED_ITEM_HEIGHT,
+        on_scroll_interval=100,
+    )
+    # where the next page starts, and a lock so overlapping scroll events load it once
+    saved_state = {"cursor": None, "generation": 0}
+    saved_lock = threading.Lock()
+    
+    def saved_item(profile):
+        details = " • ".join(
+            str(value) for value in (profile.student_id, profile.program, profile.year_level) if value
+        )
+        return ft.ListTile(
+            title=ft.Text(f"{profile.first_name} {profile.last_name}", size=14),
+            subtitle=ft.Text(details or "No details", size=12),
+            dense=True,
+        )
+    
+    def load_saved_page(generation):
+        with saved_lock:
+            if generation != saved_state["generation"]:
+                return  # the search changed while waiting
+            result = store.search(
+                saved_search.value or "",
+                saved_program.value or None,
+                saved_year.value or None,
+                after=saved_state["cursor"],
+                limit=PAGE_SIZE,
+            )
+            saved_list.controls.extend(saved_item(profile) for profile in result.profiles)
+            saved_state["cursor"] = result.next_cursor
+        page.update()
+    
+    def search_profiles(e):
+        with saved_lock:
+            saved_state["generation"] += 1
+            saved_state["cursor"] = None
+            saved_list.controls.clear()
+            generation = saved_state["generation"]
+            total = store.count(saved_search.value or "", saved_program.value or None, saved_year.value or None)
+            saved_count.value = f"{total} saved profile{'s' if total != 1 else ''}"
+        load_saved_page(generation)
+    
+    def on_saved_scroll(e):
+        # fetch the next page when the list is scrolled close to its end
+        if saved_state["cursor"] is not None and e.pixels >= e.max_scroll_extent - 5 * SAVED_ITEM_HEIGHT:
+            load_saved_page(saved_state["generation"])
+    
+    saved_search.on_change = search_profiles
+    saved_program.on_change = search_profiles
+    saved_year.on_change = search_profiles
+    saved_list.on_scroll = on_saved_scroll
+    
     # Buttons
     generate_btn = ft.ElevatedButton(
         "Generate Profile",
@@ -174,8 +261,15 @@ def main(page: ft.Page):
             ft.Divider(),
             ft.Text("Generated Profile:", size=18, weight=ft.FontWeight.BOLD),
             output_container,
+            ft.Divider(),
+            ft.Text("Saved Profiles:", size=18, weight=ft.FontWeight.BOLD),
+            ft.Row([saved_search, saved_program, saved_year], spacing=10),
+            saved_count,
+            saved_list,
         ], spacing=10)
     )
+    search_profiles(None)
+    page.on_close = lambda e: store.close()
 
 if __name__ == "__main__":
     ft.app(target=main)
\ No newline at end of file
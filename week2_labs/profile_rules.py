@@ -0,0 +1,86 @@
+# profile_rules.py
+# CCCS 106 - Week 2 Lab Exercise
+# Student profile validation rules, shared by the GUI and the roster batch tool
+
+from datetime import datetime
+
+FIELDS = (
+    "first_name",
+    "last_name",
+    "age",
+    "student_id",
+    "program",
+    "year_level",
+    "favorite_color",
+    "hobbies",
+)
+
+REQUIRED_FIELDS_MESSAGE = "Please fill in all required fields (Name and Age)!"
+INVALID_AGE_MESSAGE = "Please enter a valid age (number only)!"
+INVALID_YEAR_LEVEL_MESSAGE = "Year level must be 1st, 2nd, 3rd or 4th!"
+INVALID_VALUE_MESSAGE = "{field} must be text or a number!"
+
+YEAR_LEVELS = ("1st", "2nd", "3rd", "4th")
+
+
+class ProfileError(ValueError):
+    """Raised when a record doesn't pass validation; the message is shown to the user."""
+
+
+def normalize_record(record):
+    """Maps keys like "First Name" to first_name and strips whitespace from values."""
+    normalized = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        key = key.strip().lower().replace(" ", "_").replace("-", "_")
+        if key in FIELDS:
+            normalized[key] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def build_profile(record, current_year=None):
+    """
+    Validates one record (a mapping of FIELDS) and returns the profile as a dict,
+    including the derived birth and graduation years. Raises ProfileError.
+    """
+    if current_year is None:
+        current_year = datetime.now().year
+    for field in FIELDS:
+        value = record.get(field)
+        # lists, objects and true/false (which int() would turn into 1/0) aren't valid values
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (str, int, float))):
+            if field == "age":
+                raise ProfileError(INVALID_AGE_MESSAGE)
+            raise ProfileError(INVALID_VALUE_MESSAGE.format(field=field.replace("_", " ").capitalize()))
+    first_name = record.get("first_name") or ""
+    last_name = record.get("last_name") or ""
+    age = record.get("age")
+    if not all([first_name, last_name, age not in (None, "")]):
+        raise ProfileError(REQUIRED_FIELDS_MESSAGE)
+    try:
+        age = int(age)
+    except (TypeError, ValueError, OverflowError):
+        raise ProfileError(INVALID_AGE_MESSAGE) from None
+
+    year_level = record.get("year_level") or None
+    if year_level:
+        if year_level not in YEAR_LEVELS:
+            raise ProfileError(INVALID_YEAR_LEVEL_MESSAGE)
+        graduation_year = current_year + (3 - YEAR_LEVELS.index(year_level))
+    else:
+        graduation_year = current_year + 4
+
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "full_name": f"{first_name} {last_name}",
+        "student_id": record.get("student_id") or None,
+        "age": age,
+        "birth_year": current_year - age,
+        "program": record.get("program") or None,
+        "year_level": year_level,
+        "favorite_color": record.get("favorite_color") or None,
+        "hobbies": record.get("hobbies") or None,
+        "graduation_year": graduation_year,
+    }
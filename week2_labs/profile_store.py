@@ -0,0 +1,177 @@
+# profile_store.py
+# CCCS 106 - Week 2 Lab Exercise
+# SQLite storage for generated student profiles
+#
+#   store = ProfileStore("profiles.db")
+#   store.upsert(build_profile(record))
+#   page = store.search("cruz", program="BSCS")
+#   next_page = store.search("cruz", program="BSCS", after=page.next_cursor)
+#
+# Profiles with a student ID are updated in place when saved again; profiles without
+# one are always added. Searches are paginated by keyset (the last row's sort key)
+# rather than OFFSET, so fetching page 100 costs the same as fetching page 1.
+
+import sqlite3
+import threading
+from collections import namedtuple
+
+DB_PATH = "profiles.db"
+PAGE_SIZE = 50
+
+COLUMNS = (
+    "student_id",
+    "first_name",
+    "last_name",
+    "age",
+    "birth_year",
+    "program",
+    "year_level",
+    "favorite_color",
+    "hobbies",
+    "graduation_year",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    birth_year INTEGER NOT NULL,
+    program TEXT,
+    year_level TEXT,
+    favorite_color TEXT,
+    hobbies TEXT,
+    graduation_year INTEGER NOT NULL,
+    updated_at REAL NOT NULL DEFAULT (strftime('%s', 'now'))
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_profiles_student_id ON profiles (student_id);
+CREATE INDEX IF NOT EXISTS idx_profiles_name ON profiles (last_name, first_name, id);
+CREATE INDEX IF NOT EXISTS idx_profiles_program ON profiles (program, year_level, last_name, first_name, id);
+CREATE INDEX IF NOT EXISTS idx_profiles_year_level ON profiles (year_level, last_name, first_name, id);
+"""
+
+UPSERT_SQL = (
+    f"INSERT INTO profiles ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+    "ON CONFLICT (student_id) DO UPDATE SET "
+    + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:])
+    + ", updated_at = strftime('%s', 'now')"
+)
+
+Profile = namedtuple("Profile", ("id",) + COLUMNS)
+
+# rows of one page plus the cursor for the next one (None on the last page)
+ProfilePage = namedtuple("ProfilePage", ("profiles", "next_cursor"))
+
+
+def _like_pattern(text):
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _values(profile):
+    values = [profile.get(column) for column in COLUMNS]
+    values[0] = values[0] or None  # empty student IDs don't take part in the upsert
+    return values
+
+
+class ProfileStore:
+    """
+    A SQLite profile repository. One connection is shared behind a lock, so a store
+    can be used from Flet's handler threads.
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def upsert(self, profile):
+        """Saves a profile dict (as built by profile_rules.build_profile). Returns its row id."""
+        values = _values(profile)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(UPSERT_SQL, values)
+            if values[0] is None:
+                return cursor.lastrowid
+            # lastrowid isn't set when the upsert updated an existing row
+            return self._conn.execute(
+                "SELECT id FROM profiles WHERE student_id = ?", (values[0],)
+            ).fetchone()[0]
+
+    def upsert_many(self, profiles, batch_size=1000):
+        """Saves an iterable of profile dicts in batched transactions. Returns how many were saved."""
+        count = 0
+        batch = []
+        for profile in profiles:
+            batch.append(_values(profile))
+            if len(batch) >= batch_size:
+                count += self._write_batch(batch)
+                batch = []
+        if batch:
+            count += self._write_batch(batch)
+        return count
+
+    def _write_batch(self, batch):
+        with self._lock, self._conn:
+            self._conn.executemany(UPSERT_SQL, batch)
+        return len(batch)
+
+    def get(self, student_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT id, {', '.join(COLUMNS)} FROM profiles WHERE student_id = ?", (student_id,)
+            ).fetchone()
+        return Profile._make(row) if row else None
+
+    def _filters(self, text, program, year_level):
+        clauses, params = [], []
+        if program:
+            clauses.append("program = ?")
+            params.append(program)
+        if year_level:
+            clauses.append("year_level = ?")
+            params.append(year_level)
+        if text:
+            pattern = _like_pattern(text)
+            clauses.append(
+                "(first_name || ' ' || last_name LIKE ? ESCAPE '\\' OR student_id LIKE ? ESCAPE '\\')"
+            )
+            params.extend((pattern, pattern))
+        return clauses, params
+
+    def search(self, text="", program=None, year_level=None, after=None, limit=PAGE_SIZE):
+        """
+        Returns a ProfilePage of up to limit profiles ordered by last name, first name,
+        matching text (in the name or student ID) and the optional program/year level.
+        Pass the previous page's next_cursor as after to get the following page.
+        """
+        clauses, params = self._filters(text, program, year_level)
+        if after is not None:
+            clauses.append("(last_name, first_name, id) > (?, ?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT id, {', '.join(COLUMNS)} FROM profiles {where} "
+            "ORDER BY last_name, first_name, id LIMIT ?"
+        )
+        with self._lock:
+            rows = list(map(Profile._make, self._conn.execute(sql, (*params, limit + 1))))
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            return ProfilePage(rows, (last.last_name, last.first_name, last.id))
+        return ProfilePage(rows, None)
+
+    def count(self, text="", program=None, year_level=None):
+        clauses, params = self._filters(text, program, year_level)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM profiles {where}", params).fetchone()[0]
@@ -0,0 +1,259 @@
+# roster_batch.py
+# CCCS 106 - Week 2 Lab Exercise
+# Generates student profiles for a whole class roster without the GUI
+#
+#   python roster_batch.py roster.csv -o profiles.jsonl
+#   python roster_batch.py roster.json -o profiles.html --workers 4
+#
+# Input is CSV (with a header row), JSON Lines, or a JSON array of objects, using the
+# same field names as the form (first_name, last_name, age, student_id, program,
+# year_level, favorite_color, hobbies). Records are read, validated on a process pool
+# and written out one window at a time, so memory stays flat however long the roster
+# is. Output is JSON Lines or, for .html files, a single table. Invalid records are
+# reported on stderr with their record number. With --db the profiles are also saved
+# to the profile store used by personal_info_gui.py.
+
+import argparse
+import csv
+import html
+import json
+import multiprocessing
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from functools import partial
+from itertools import islice
+
+from profile_rules import FIELDS, ProfileError, build_profile, normalize_record
+from profile_store import ProfileStore
+
+CHUNK_SIZE = 500  # records sent to a worker at a time
+WINDOW_CHUNKS = 8  # chunks per worker in flight; bounds memory use
+JSON_READ_SIZE = 64 * 1024
+
+HTML_COLUMNS = (
+    ("full_name", "Full Name"),
+    ("student_id", "Student ID"),
+    ("age", "Age"),
+    ("birth_year", "Birth Year"),
+    ("program", "Program"),
+    ("year_level", "Year Level"),
+    ("favorite_color", "Favorite Color"),
+    ("hobbies", "Hobbies"),
+    ("graduation_year", "Expected Graduation"),
+)
+
+
+# ---------------------------------------------------------------- reading
+
+class InvalidJson:
+    """Stands in for a JSON Lines record that couldn't be parsed, so it is rejected like any other."""
+
+    def __repr__(self):
+        return "INVALID_JSON"
+
+
+INVALID_JSON = InvalidJson()
+
+
+def _iter_json_array(f):
+    """Yields the objects of a top-level JSON array, decoding it piece by piece."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    started = False
+    eof = False
+    while True:
+        # skip whitespace and separators
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(JSON_READ_SIZE), 0
+            eof = not buffer
+        if pos >= len(buffer):
+            if started:
+                raise ValueError("Unexpected end of JSON roster")
+            return
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("JSON roster must be an array of objects")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = f.read(JSON_READ_SIZE)
+            eof = not more
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        if end == len(buffer) and not eof:
+            # a number at the end of the buffer may continue in the next read
+            more = f.read(JSON_READ_SIZE)
+            eof = not more
+            if more:
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+        yield item
+        pos = end
+
+
+def read_roster(path):
+    """Yields raw records (dicts) from a CSV, JSON Lines or JSON array file."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if path.lower().endswith(".csv"):
+            yield from csv.DictReader(f)
+            return
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        if first == "[":
+            yield from _iter_json_array(f)
+        else:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        yield INVALID_JSON
+
+
+# ---------------------------------------------------------------- validating
+
+def validate_record(numbered_record, current_year):
+    """Worker function: returns (record_number, profile, error_message)."""
+    number, record = numbered_record
+    if isinstance(record, InvalidJson):
+        return number, None, "invalid JSON"
+    if not isinstance(record, dict):
+        return number, None, "Record is not an object"
+    try:
+        return number, build_profile(normalize_record(record), current_year), None
+    except ProfileError as e:
+        return number, None, str(e)
+
+
+def generate_profiles(records, workers=None, chunksize=CHUNK_SIZE, current_year=None):
+    """
+    Yields (record_number, profile, error_message) for each record, in order.
+    Records are numbered from 1. With workers=0 validation runs in this process.
+    """
+    if current_year is None:
+        current_year = datetime.now().year
+    validate = partial(validate_record, current_year=current_year)
+    numbered = enumerate(records, start=1)
+    if workers == 0:
+        yield from map(validate, numbered)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = workers * chunksize * WINDOW_CHUNKS
+    with multiprocessing.Pool(workers) as pool:
+        # Pool.imap reads its whole input up front, so hand it one window at a time
+        while True:
+            batch = list(islice(numbered, window))
+            if not batch:
+                break
+            yield from pool.imap(validate, batch, chunksize)
+
+
+# ---------------------------------------------------------------- writing
+
+class JsonLinesWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, profile):
+        self.f.write(json.dumps(profile, ensure_ascii=False) + "\n")
+
+    def close(self):
+        pass
+
+
+class HtmlWriter:
+    def __init__(self, f, title="Student Profiles"):
+        self.f = f
+        f.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(title)}</title>\n"
+            "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+            "th,td{border:1px solid #ccc;padding:4px 8px}th{background:#e8eaf6}</style>\n"
+            f"</head>\n<body>\n<h1>🎓 {html.escape(title)}</h1>\n<table>\n<tr>"
+            + "".join(f"<th>{label}</th>" for _, label in HTML_COLUMNS)
+            + "</tr>\n"
+        )
+
+    def write(self, profile):
+        cells = (
+            html.escape("Not provided" if profile[key] is None else str(profile[key]))
+            for key, _ in HTML_COLUMNS
+        )
+        self.f.write("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>\n")
+
+    def close(self):
+        self.f.write(
+            "</table>\n"
+            f"<p>Profiles generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>\n"
+            "</body>\n</html>\n"
+        )
+
+
+def process_roster(source, output=None, workers=None, chunksize=CHUNK_SIZE, errors=sys.stderr, store=None):
+    """
+    Converts a roster file to profiles, also saving them to store (a ProfileStore) if
+    given. Returns (profiles written, records rejected).
+    """
+    out = open(output, "w", encoding="utf-8") if output else sys.stdout
+    written = rejected = 0
+    pending = []
+    try:
+        writer = HtmlWriter(out) if output and output.lower().endswith((".html", ".htm")) else JsonLinesWriter(out)
+        for number, profile, error in generate_profiles(read_roster(source), workers, chunksize):
+            if error:
+                rejected += 1
+                print(f"Record {number}: {error}", file=errors)
+            else:
+                writer.write(profile)
+                written += 1
+                if store is not None:
+                    pending.append(profile)
+                    if len(pending) >= CHUNK_SIZE:
+                        store.upsert_many(pending)
+                        pending.clear()
+        if pending:
+            store.upsert_many(pending)
+        writer.close()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return written, rejected
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate student profiles from a roster file")
+    parser.add_argument("roster", help=f"CSV, JSON Lines or JSON file with columns {', '.join(FIELDS)}")
+    parser.add_argument("-o", "--output", help="profiles file, .jsonl or .html (default: JSON Lines on stdout)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count, 0 = none)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE, help="records per worker task")
+    parser.add_argument("--db", help="also save the profiles to this profile database (e.g. profiles.db)")
+    args = parser.parse_args()
+
+    store = ProfileStore(args.db) if args.db else None
+    try:
+        written, rejected = process_roster(
+            args.roster, args.output, args.workers, args.chunksize, store=store
+        )
+    except (OSError, ValueError, sqlite3.Error) as e:
+        sys.exit(f"Error: {e}")
+    finally:
+        if store is not None:
+            store.close()
+    print(f"{written} profiles generated, {rejected} records rejected", file=sys.stderr)
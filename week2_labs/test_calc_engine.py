@@ -0,0 +1,115 @@
+# test_calc_engine.py
+"""Simple tests for the calculator engine."""
+
+import time
+
+from calc_engine import CalculatorError, evaluate
+
+
+def test_fraction_round_is_capped():
+    """Test that round() in fraction mode can't build a huge result or stall."""
+    start = time.perf_counter()
+    messages = []
+    for text in ("round(1/3, 10**7)", "round(1/3, 10**8)", "round(1/3, -10**8)"):
+        try:
+            evaluate(text, mode="fraction")
+            messages.append(None)
+        except CalculatorError as e:
+            messages.append(str(e))
+    elapsed = time.perf_counter() - start
+    small = evaluate("round(1/3, 5)", mode="fraction")
+    if all(messages) and elapsed < 1 and str(small) == "33333/100000":
+        print("✅ round() digits capped in fraction mode")
+        return True
+    print(f"❌ round() not capped: {messages} in {elapsed:.1f} s, round(1/3, 5) = {small}")
+    return False
+
+
+def test_round_needs_whole_digits():
+    """Test that round() rejects a fractional number of digits in every mode."""
+    failures = []
+    for mode in ("float", "decimal", "fraction"):
+        try:
+            evaluate("round(2.567, 1/2)", mode=mode)
+            failures.append(mode)
+        except CalculatorError:
+            pass
+    if not failures:
+        print("✅ round() needs whole-number digits")
+        return True
+    print(f"❌ Fractional digits accepted in: {failures}")
+    return False
+
+
+def test_huge_literal():
+    """Test that an integer literal too large for a float is a CalculatorError."""
+    try:
+        evaluate("1" + "0" * 400 + " + 1")
+    except CalculatorError as e:
+        if str(e) == "Number is too large":
+            print("✅ Huge literal rejected with a clear message")
+            return True
+    except OverflowError:
+        pass
+    print("❌ Huge literal not rejected cleanly")
+    return False
+
+
+def test_fraction_results_printable():
+    """Test that fraction mode never returns a result too long to convert to text."""
+    printed = []
+    for text in ("1e5000", "1e10000 * 1e10000", "(2**40000)**2", "1e3000 * 1e3000", "2**14000"):
+        try:
+            printed.append(len(str(evaluate(text, mode="fraction"))))
+        except CalculatorError:
+            pass
+        except ValueError:
+            print(f"❌ {text} gave a result that can't be printed")
+            return False
+    if printed == [4215]:
+        print("✅ Fraction results capped at a printable size")
+        return True
+    print(f"❌ Unexpected results: {printed}")
+    return False
+
+
+def test_decimal_error_messages():
+    """Test that decimal signals are reported in words, not as a list of classes."""
+    expected = {
+        "1e3000 // 1e-3000": "Result is too large",
+        "sqrt(-1)": "math domain error",
+        "0 / 0": "Cannot divide by zero",
+    }
+    messages = {}
+    for text in expected:
+        try:
+            evaluate(text, mode="decimal")
+        except CalculatorError as e:
+            messages[text] = str(e)
+    if messages == expected:
+        print("✅ Decimal errors reported with readable messages")
+        return True
+    print(f"❌ Unexpected messages: {messages}")
+    return False
+
+
+def run_tests():
+    """Run all tests."""
+    print("Running Calculator Engine Tests\n")
+    print("=" * 50)
+
+    results = []
+    results.append(test_fraction_round_is_capped())
+    results.append(test_round_needs_whole_digits())
+    results.append(test_huge_literal())
+    results.append(test_fraction_results_printable())
+    results.append(test_decimal_error_messages())
+
+    print("\n" + "=" * 50)
+    passed = sum(results)
+    total = len(results)
+    print(f"\nTests Passed: {passed}/{total}")
+
+
+if __name__ == "__main__":
+    run_tests()
@@ -0,0 +1,84 @@
+import threading
+
+# Statement text must stay identical between calls for the prepared cursor to reuse it
+SELECT_PASSWORD = "SELECT password FROM users WHERE username = %s"
+UPDATE_PASSWORD = "UPDATE users SET password = %s WHERE username = %s"
+PASSWORD_COLUMN_WIDTH = (
+    "SELECT character_maximum_length FROM information_schema.columns "
+    "WHERE table_schema = DATABASE() AND table_name = 'users' AND column_name = 'password'"
+)
+
+class AuthDAO:
+    """
+    Data access for login. Each pooled connection gets its own server-side prepared
+    cursor per statement, created on first use and then reused, so the server parses
+    the lookup once per connection rather than once per login.
+    Prepared cursors are keyed by the server's connection id; a reconnect gets a new
+    id and therefore fresh statements.
+    """
+
+    def __init__(self, max_cached_connections=32):
+        self.max_cached_connections = max_cached_connections
+        self._cursors = {}
+        self._evicted = {}  # connection id -> evicted cursors, closed when that connection is next used
+        self._lock = threading.Lock()
+
+    def _evict_all(self):
+        # Another thread may be executing on one of these cursors right now, so they
+        # can't be closed here; each is closed by the next thread that holds its
+        # connection. Pending closes for connections that haven't been used since the
+        # last eviction are dropped: those connections are gone, and their server
+        # session (and prepared statements) with them.
+        evicted = {}
+        for (connection_id, _), cursor in self._cursors.items():
+            pending = evicted.get(connection_id)
+            if pending is None:
+                pending = evicted[connection_id] = self._evicted.get(connection_id, [])
+            pending.append(cursor)
+        self._evicted = evicted
+        self._cursors.clear()
+
+    def _cursor(self, connection, statement):
+        connection_id = connection.connection_id
+        key = (connection_id, statement)
+        with self._lock:
+            cursor = self._cursors.get(key)
+            if cursor is None and len(self._cursors) >= self.max_cached_connections * 2:
+                # stale entries left behind by reconnected connections
+                self._evict_all()
+            stale = self._evicted.pop(connection_id, ())
+            if cursor is None:
+                cursor = self._cursors[key] = connection.cursor(prepared=True)
+        # this thread holds the connection, so its evicted cursors can be closed safely
+        for old in stale:
+            try:
+                old.close()
+            except Exception:
+                pass
+        return cursor
+
+    def get_password(self, connection, username):
+        """Returns the stored password hash for username, or None if there is no such user."""
+        cursor = self._cursor(connection, SELECT_PASSWORD)
+        cursor.execute(SELECT_PASSWORD, (username,))
+        rows = cursor.fetchall()
+        if not rows:
+            return None
+        value = rows[0][0]
+        return value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else value
+
+    def set_password(self, connection, username, password_hash):
+        """Replaces the stored password hash for username."""
+        cursor = self._cursor(connection, UPDATE_PASSWORD)
+        cursor.execute(UPDATE_PASSWORD, (password_hash, username))
+        connection.commit()
+
+    def get_password_column_width(self, connection):
+        """Returns the maximum length of users.password, or None if it can't be determined."""
+        cursor = connection.cursor()
+        try:
+            cursor.execute(PASSWORD_COLUMN_WIDTH)
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        return int(row[0]) if row and row[0] is not None else None
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from auth_dao import AuthDAO
+from db_connection import get_connection, POOL_SIZE
+from passwords import hash_password, needs_rehash, verify_password
+from rate_limiter import LoginRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a login attempt is abandoned
+AUTH_TIMEOUT = 10.0
+
+class RateLimitedError(Exception):
+    """Raised when a login is rejected by the rate limiter before reaching the database."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many login attempts. Try again in {retry_after:.0f} seconds.")
+        self.retry_after = retry_after
+
+_dummy = None
+
+def _dummy_hash():
+    global _dummy
+    if _dummy is None:
+        _dummy = hash_password(secrets.token_urlsafe(16))
+    return _dummy
+
+class AuthService:
+    """
+    Runs login checks on a thread pool so Flet handlers can await them without
+    blocking the event loop. One worker per pooled connection lets concurrent
+    logins run side by side instead of queuing behind each other; scrypt releases
+    the GIL, so hash checks run in parallel too.
+    """
+
+    def __init__(self, max_workers=POOL_SIZE, timeout=AUTH_TIMEOUT, limiter=None):
+        self.timeout = timeout
+        self.limiter = limiter
+        self.dao = AuthDAO(max_cached_connections=max_workers)
+        self._password_width = None  # users.password length, looked up before the first rehash
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="auth")
+
+    def _fetch_stored_password(self, username):
+        connection = get_connection()
+        try:
+            return self.dao.get_password(connection, username)
+        finally:
+            # returns the connection to the pool
+            connection.close()
+
+    def _store_password_hash(self, username, password_hash):
+        connection = get_connection()
+        try:
+            self.dao.set_password(connection, username, password_hash)
+        finally:
+            connection.close()
+
+    def _can_store(self, password_hash):
+        # until tools/migrate_db.py widens users.password a new hash may not fit, and
+        # non-strict MySQL would silently truncate it and lock the user out
+        if self._password_width is None:
+            connection = get_connection()
+            try:
+                self._password_width = self.dao.get_password_column_width(connection) or 0
+            finally:
+                connection.close()
+        return len(password_hash) <= self._password_width
+
+    def _rehash(self, username, password):
+        # best effort: the password was correct, so a failed upgrade must not fail the login
+        try:
+            password_hash = hash_password(password)
+            if self._can_store(password_hash):
+                self._store_password_hash(username, password_hash)
+        except Exception:
+            logger.warning("Could not upgrade the password hash for %r", username, exc_info=True)
+
+    def _check_credentials(self, username, password):
+        stored = self._fetch_stored_password(username)
+        # the connection is back in the pool before the (deliberately slow) hash check
+        if stored is None:
+            # spend the same time as a real check so unknown usernames can't be told apart
+            verify_password(password, _dummy_hash(), cache=None)
+            return False
+        if not verify_password(password, stored):
+            return False
+        if needs_rehash(stored):
+            # upgrades plaintext rows and hashes made with an older cost
+            self._rehash(username, password)
+        return True
+
+    async def authenticate(self, username, password, client="local"):
+        """
+        Returns True if the username/password pair is valid.
+        Raises RateLimitedError if the username or client has made too many attempts,
+        asyncio.TimeoutError after `timeout` seconds and mysql.connector.Error on
+        database failures. Cancelling the awaiting task abandons the attempt.
+        """
+        if self.limiter:
+            wait = self.limiter.attempt(username, client)
+            if wait > 0:
+                raise RateLimitedError(wait)
+        loop = asyncio.get_running_loop()
+        check = loop.run_in_executor(self._executor, self._check_credentials, username, password)
+        ok = await asyncio.wait_for(check, self.timeout)
+        if ok and self.limiter:
+            self.limiter.record_success(username)
+        return ok
+
+    def shutdown(self):
+        """Drops queued attempts and stops the worker threads."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+_service = None
+
+def get_auth_service():
+    """Returns the process-wide AuthService shared by all app sessions."""
+    global _service
+    if _service is None:
+        # keep lockouts across restarts when Flet provides an app data directory
+        storage = os.getenv("FLET_APP_STORAGE_DATA")
+        persist_path = os.path.join(storage, "login_attempts.db") if storage else None
+        _service = AuthService(limiter=LoginRateLimiter(persist_path=persist_path))
+    return _service
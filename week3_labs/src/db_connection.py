@@ -1,10 +1,77 @@
+import threading
+import time
 import mysql.connector
+from mysql.connector import pooling, Error
+from mysql.connector.errors import PoolError
+from settings import DB_SETTINGS
+
+# Connection settings come from db_settings.json / DB_* environment variables
+DB_CONFIG = {
+    "host": DB_SETTINGS["host"],
+    "port": DB_SETTINGS["port"],
+    "user": DB_SETTINGS["user"],
+    "password": DB_SETTINGS["password"],
+    "database": DB_SETTINGS["database"],
+    "connection_timeout": DB_SETTINGS["connect_timeout"],
+    # pooled sessions are not reset between uses, so don't leave read snapshots open
+    "autocommit": True,
+}
+
+POOL_NAME = "fletapp_pool"
+POOL_SIZE = DB_SETTINGS["pool_size"]
+# How long get_connection waits for a free connection when the pool is exhausted
+POOL_WAIT_SECONDS = 5.0
+
+_pool = None
+_pool_lock = threading.Lock()
 
 def connect_db():
-    connection = mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",
-        database="fletapp"
-    )
-    return connection
\ No newline at end of file
+    """Opens a new, unpooled connection. Prefer get_connection() for short-lived work."""
+    connection = mysql.connector.connect(**DB_CONFIG)
+    return connection
+
+def get_pool(size=None):
+    """
+    Returns the shared connection pool, creating it on first use.
+    If the server is unreachable the error propagates and the next call tries again.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name=POOL_NAME,
+                    pool_size=size or POOL_SIZE,
+                    # resetting the session would drop the prepared statements kept per connection
+                    pool_reset_session=False,
+                    **DB_CONFIG
+                )
+    return _pool
+
+def set_pool(pool):
+    """Replaces the shared pool, e.g. with a stand-in exposing get_connection() in tests."""
+    global _pool
+    with _pool_lock:
+        _pool = pool
+
+def get_connection(wait=POOL_WAIT_SECONDS):
+    """
+    Borrows a connection from the pool; calling close() on it returns it to the pool.
+    The connection is health-checked with a ping and transparently reconnected if the
+    server dropped it. Waits up to `wait` seconds if every connection is in use.
+    """
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            connection = get_pool().get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+    try:
+        connection.ping(reconnect=True, attempts=2, delay=0)
+    except Error:
+        connection.close()
+        raise
+    return connection
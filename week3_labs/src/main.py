@@ -1,7 +1,12 @@
+import asyncio
 import flet as ft
-from db_connection import connect_db
+from auth_service import get_auth_service, RateLimitedError
+from sessions import get_session_store
 from mysql.connector import Error
 
+# client_storage key holding the session token
+SESSION_KEY = "userlogin.session"
+
 def main(page: ft.Page):
     # Configure the page
     page.window.alignment = ft.alignment.center
@@ -65,7 +70,16 @@ def main(page: ft.Page):
         page.update()
 
     # Login logic
-    def login_click(e):
+    auth = get_auth_service()
+    sessions = get_session_store()
+    pending_logins = set()
+
+    def set_busy(busy):
+        login_button.disabled = busy
+        login_progress.visible = busy
+        page.update()
+
+    async def login_click(e):
         username = username_field.value
         password = password_field.value
 
@@ -79,19 +93,16 @@ def main(page: ft.Page):
             )
             return
 
-        # Database authentication
-        connection = None
+        # Database authentication runs off the event loop
+        set_busy(True)
+        task = asyncio.ensure_future(auth.authenticate(username, password, page.client_ip or "local"))
+        pending_logins.add(task)
         try:
-            connection = connect_db()
-            cursor = connection.cursor()
-            
-            # Use a parameterized query to prevent SQL injection
-            query = "SELECT username FROM users WHERE username = %s AND password = %s"
-            
-            cursor.execute(query, (username, password))
-            result = cursor.fetchone()
+            result = await task
 
             if result:
+                # remember the login so later visits skip the database
+                page.client_storage.set(SESSION_KEY, sessions.issue(username))
                 show_dialog(
                     title='Login Successful',
                     content=f'Welcome, {username}!',
@@ -106,6 +117,23 @@ def main(page: ft.Page):
                     icon_color='red'
                 )
 
+        except RateLimitedError as err:
+            show_dialog(
+                title='Too Many Attempts',
+                content=str(err),
+                icon_name=ft.Icons.LOCK_CLOCK,
+                icon_color='red'
+            )
+        except asyncio.TimeoutError:
+            show_dialog(
+                title='Database Error',
+                content='The database took too long to respond. Please try again.',
+                icon_name=ft.Icons.WARNING,
+                icon_color='orange'
+            )
+        except asyncio.CancelledError:
+            # window closed while logging in
+            return
         except Error as err:
             show_dialog(
                 title='Database Error',
@@ -114,8 +142,18 @@ def main(page: ft.Page):
                 icon_color='orange'
             )
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            pending_logins.discard(task)
+            if not task.cancelled():
+                set_busy(False)
+
+    def cancel_pending_logins(e):
+        for task in list(pending_logins):
+            task.cancel()
+
+    page.on_close = cancel_pending_logins
+    page.on_disconnect = cancel_pending_logins
+
+    login_progress = ft.ProgressRing(width=20, height=20, stroke_width=2, visible=False)
 
     # Login button
     login_button = ft.ElevatedButton(
@@ -132,7 +170,7 @@ def main(page: ft.Page):
             username_field,
             password_field,
             ft.Row(
-                controls=[login_button],
+                controls=[login_progress, login_button],
                 alignment=ft.MainAxisAlignment.END,
                 width=300
             )
@@ -152,5 +190,20 @@ def main(page: ft.Page):
     
     page.add(main_container)
 
+    # Resume a previous session, validated locally without touching MySQL
+    token = page.client_storage.get(SESSION_KEY)
+    if token:
+        session_user = sessions.validate(token)
+        if session_user:
+            username_field.value = session_user
+            show_dialog(
+                title='Welcome Back',
+                content=f'You are still signed in as {session_user}.',
+                icon_name=ft.Icons.CHECK_CIRCLE,
+                icon_color='green'
+            )
+        else:
+            page.client_storage.remove(SESSION_KEY)
+
 # Start the Flet application
 ft.app(target=main)
\ No newline at end of file
@@ -0,0 +1,45 @@
+"""Versioned schema changes for the fletapp MySQL database (run with tools/migrate_db.py)."""
+
+def _has_username_index(cursor):
+    cursor.execute(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = 'users' "
+        "AND column_name = 'username' AND seq_in_index = 1"
+    )
+    return cursor.fetchone() is not None
+
+def _add_username_index(cursor):
+    # a primary key or unique key on username already makes the lookup a point read
+    if not _has_username_index(cursor):
+        cursor.execute("CREATE INDEX idx_users_username ON users (username)")
+
+def _widen_password_column(cursor):
+    # scrypt hashes are ~90 characters
+    cursor.execute("ALTER TABLE users MODIFY password VARCHAR(255) NOT NULL")
+
+# Applied in order and recorded in schema_migrations; append new steps to the end.
+MIGRATIONS = (
+    ("001_users_username_index", _add_username_index),
+    ("002_users_password_varchar255", _widen_password_column),
+)
+
+def migrate(connection):
+    """Applies pending MIGRATIONS. Returns the names of the ones applied."""
+    cursor = connection.cursor()
+    cursor.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " name VARCHAR(100) PRIMARY KEY,"
+        " applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+    )
+    cursor.execute("SELECT name FROM schema_migrations")
+    done = {row[0] for row in cursor.fetchall()}
+    applied = []
+    for name, step in MIGRATIONS:
+        if name in done:
+            continue
+        step(cursor)
+        cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+        connection.commit()
+        applied.append(name)
+    cursor.close()
+    return applied
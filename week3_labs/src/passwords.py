@@ -0,0 +1,115 @@
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+# scrypt cost parameters. N (CPU/memory cost) can be tuned with the
+# PASSWORD_SCRYPT_N environment variable; see tools/bench_passwords.py.
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+PREFIX = "scrypt"
+
+# Successful verifications are remembered this long so repeated logins skip scrypt
+CACHE_TTL_SECONDS = 5 * 60
+CACHE_SIZE = 1024
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES
+    )
+
+def hash_password(password, n=None, r=SCRYPT_R, p=SCRYPT_P):
+    """Returns a salted scrypt hash in the form scrypt$n$r$p$salt$hash."""
+    n = n or SCRYPT_N
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"{PREFIX}${n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+def is_hashed(stored):
+    """True if stored is a hash produced by hash_password (not a legacy plaintext password)."""
+    return stored.startswith(PREFIX + "$")
+
+def _parse(stored):
+    _, n, r, p, salt, digest = stored.split("$")
+    return int(n), int(r), int(p), base64.b64decode(salt), base64.b64decode(digest)
+
+def needs_rehash(stored, n=None):
+    """True if stored is plaintext or was hashed with different cost parameters."""
+    if not is_hashed(stored):
+        return True
+    stored_n, r, p, _, _ = _parse(stored)
+    return (stored_n, r, p) != (n or SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+class VerificationCache:
+    """
+    Remembers recent successful verifications so a user logging in again does not
+    pay for scrypt every time. Entries are keyed by an HMAC of the stored hash and
+    the password under a per-process secret, so neither is kept in memory, and a
+    changed password (new stored hash) never matches an old entry.
+    """
+
+    def __init__(self, size=CACHE_SIZE, ttl=CACHE_TTL_SECONDS):
+        self.size = size
+        self.ttl = ttl
+        self._secret = secrets.token_bytes(32)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, password, stored):
+        return hmac.new(self._secret, f"{stored}\0{password}".encode("utf-8"), hashlib.sha256).digest()
+
+    def hit(self, password, stored):
+        key = self._key(password, stored)
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, password, stored):
+        key = self._key(password, stored)
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+_cache = VerificationCache()
+
+def verify_password(password, stored, cache=_cache):
+    """
+    Checks password against a stored hash. Legacy plaintext values are compared in
+    constant time so existing rows keep working until they are rehashed.
+    """
+    if not stored:
+        return False
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+    if cache is not None and cache.hit(password, stored):
+        return True
+    try:
+        n, r, p, salt, digest = _parse(stored)
+    except ValueError:
+        return False
+    ok = hmac.compare_digest(_scrypt(password, salt, n, r, p), digest)
+    if ok and cache is not None:
+        cache.add(password, stored)
+    return ok
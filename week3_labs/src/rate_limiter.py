@@ -0,0 +1,123 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+
+# Defaults: 5 attempts per username and 20 per client within 5 minutes
+USERNAME_LIMIT = 5
+CLIENT_LIMIT = 20
+WINDOW_SECONDS = 5 * 60
+
+class SlidingWindowLimiter:
+    """
+    Counts events per key over a sliding time window using a deque of timestamps.
+    A key is blocked once it has `limit` events inside the last `window` seconds,
+    until the oldest of them ages out.
+
+    If persist_path is given, events are also written to a small SQLite file and
+    reloaded on start, so lockouts survive an app restart.
+    """
+
+    def __init__(self, limit, window=WINDOW_SECONDS, persist_path=None, name="default"):
+        self.limit = limit
+        self.window = window
+        self.name = name
+        self._events = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if persist_path:
+            self._db = sqlite3.connect(persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS rate_events (limiter TEXT NOT NULL, key TEXT NOT NULL, at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_rate_events ON rate_events (limiter, at)")
+            self._load()
+
+    def _load(self):
+        cutoff = time.time() - self.window
+        with self._db:
+            self._db.execute("DELETE FROM rate_events WHERE limiter = ? AND at < ?", (self.name, cutoff))
+        rows = self._db.execute(
+            "SELECT key, at FROM rate_events WHERE limiter = ? ORDER BY at", (self.name,)
+        ).fetchall()
+        for key, at in rows:
+            self._events.setdefault(key, deque(maxlen=self.limit)).append(at)
+
+    def _prune(self, key, now):
+        events = self._events.get(key)
+        if events is None:
+            return None
+        cutoff = now - self.window
+        while events and events[0] <= cutoff:
+            events.popleft()
+        if not events:
+            del self._events[key]
+            return None
+        return events
+
+    def retry_after(self, key):
+        """Seconds until key may try again, or 0 if it is not blocked."""
+        now = time.time()
+        with self._lock:
+            events = self._prune(key, now)
+            if events is None or len(events) < self.limit:
+                return 0
+            return events[-self.limit] + self.window - now
+
+    def hit(self, key):
+        """Records one event (e.g. a login attempt) for key."""
+        now = time.time()
+        with self._lock:
+            events = self._prune(key, now)
+            if events is None:
+                # only the newest `limit` timestamps are needed to decide
+                events = self._events[key] = deque(maxlen=self.limit)
+            events.append(now)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "DELETE FROM rate_events WHERE limiter = ? AND key = ? AND at <= ?",
+                        (self.name, key, now - self.window)
+                    )
+                    self._db.execute(
+                        "INSERT INTO rate_events (limiter, key, at) VALUES (?, ?, ?)", (self.name, key, now)
+                    )
+
+    def reset(self, key):
+        """Forgets all events for key (e.g. after a successful login)."""
+        with self._lock:
+            self._events.pop(key, None)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM rate_events WHERE limiter = ? AND key = ?", (self.name, key))
+
+class LoginRateLimiter:
+    """
+    Throttles login attempts per username and per client before any database work.
+    Every attempt is counted up front, so a burst of parallel attempts cannot slip
+    past the limit while earlier ones are still in flight. A successful login clears
+    the username's history.
+    """
+
+    def __init__(self, username_limit=USERNAME_LIMIT, client_limit=CLIENT_LIMIT,
+                 window=WINDOW_SECONDS, persist_path=None):
+        self.by_username = SlidingWindowLimiter(username_limit, window, persist_path, name="username")
+        self.by_client = SlidingWindowLimiter(client_limit, window, persist_path, name="client")
+        self._lock = threading.Lock()
+
+    def attempt(self, username, client):
+        """
+        Records a login attempt if both limits allow it and returns 0; otherwise
+        records nothing and returns the seconds the caller must wait.
+        """
+        username = username.lower()
+        with self._lock:
+            wait = max(self.by_username.retry_after(username), self.by_client.retry_after(client))
+            if wait > 0:
+                return wait
+            self.by_username.hit(username)
+            self.by_client.hit(client)
+            return 0
+
+    def record_success(self, username):
+        self.by_username.reset(username.lower())
@@ -0,0 +1,129 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+
+# How long a session stays valid after login
+SESSION_TTL_SECONDS = 12 * 60 * 60
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+class SessionStore:
+    """
+    Issues signed, expiring session tokens after a successful login and validates
+    them locally, so later actions don't need a database round-trip.
+
+    A token is `payload.signature`, where the payload carries the username, expiry
+    and a random session id, and the signature is an HMAC over it. Live sessions are
+    kept in an in-memory TTL map (so they can be revoked). If persist_path is given
+    the map is also saved to disk so sessions survive an app restart; the signing
+    secret must then be stable too (SESSION_SECRET or a secret file).
+    """
+
+    def __init__(self, secret, ttl=SESSION_TTL_SECONDS, persist_path=None):
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self._secret = secret
+        self._sessions = {}
+        self._lock = threading.Lock()
+        if persist_path and os.path.exists(persist_path):
+            try:
+                with open(persist_path, encoding="utf-8") as f:
+                    self._sessions = {k: tuple(v) for k, v in json.load(f).items()}
+            except (OSError, ValueError):
+                self._sessions = {}
+            self._purge(time.time())
+
+    def _sign(self, payload):
+        return hmac.new(self._secret, payload.encode("ascii"), hashlib.sha256).digest()
+
+    def _purge(self, now):
+        for sid in [sid for sid, (_, expires) in self._sessions.items() if expires <= now]:
+            del self._sessions[sid]
+
+    def _save(self):
+        if not self.persist_path:
+            return
+        tmp = f"{self.persist_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._sessions, f)
+        os.replace(tmp, self.persist_path)
+
+    def issue(self, username):
+        """Starts a session for username and returns its token."""
+        now = time.time()
+        sid = secrets.token_urlsafe(16)
+        expires = int(now + self.ttl)
+        payload = _b64(json.dumps([username, expires, sid], separators=(",", ":")).encode("utf-8"))
+        with self._lock:
+            self._purge(now)
+            self._sessions[sid] = (username, expires)
+            self._save()
+        return f"{payload}.{_b64(self._sign(payload))}"
+
+    def _parse(self, token):
+        try:
+            payload, signature = token.split(".")
+            if not hmac.compare_digest(_unb64(signature), self._sign(payload)):
+                return None
+            username, expires, sid = json.loads(_unb64(payload))
+        except (AttributeError, ValueError, TypeError):
+            return None
+        return username, expires, sid
+
+    def validate(self, token):
+        """Returns the username of a valid, unexpired, unrevoked token, otherwise None."""
+        parsed = self._parse(token)
+        if parsed is None:
+            return None
+        username, expires, sid = parsed
+        if expires <= time.time():
+            return None
+        with self._lock:
+            session = self._sessions.get(sid)
+        return username if session and session[0] == username else None
+
+    def revoke(self, token):
+        """Ends the session behind token (e.g. on logout)."""
+        parsed = self._parse(token)
+        if parsed is None:
+            return
+        with self._lock:
+            if self._sessions.pop(parsed[2], None) is not None:
+                self._save()
+
+def _load_secret(storage):
+    secret = os.getenv("SESSION_SECRET")
+    if secret:
+        return secret.encode("utf-8")
+    if not storage:
+        # sessions then only last as long as the process
+        return secrets.token_bytes(32)
+    path = os.path.join(storage, "session_secret")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    secret = secrets.token_bytes(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(secret)
+    return secret
+
+_store = None
+
+def get_session_store():
+    """Returns the process-wide SessionStore, persisted in Flet's app data directory if available."""
+    global _store
+    if _store is None:
+        storage = os.getenv("FLET_APP_STORAGE_DATA")
+        persist_path = os.path.join(storage, "sessions.json") if storage else None
+        _store = SessionStore(_load_secret(storage), persist_path=persist_path)
+    return _store
@@ -0,0 +1,45 @@
+import json
+import os
+from pathlib import Path
+
+# Used when neither the settings file nor the environment provides a value
+DEFAULTS = {
+    "host": "localhost",
+    "port": 3306,
+    "user": "root",
+    "password": "",
+    "database": "fletapp",
+    "pool_size": 5,
+    "connect_timeout": 5,
+}
+
+# Environment variables override the settings file
+ENV_VARS = {
+    "host": "DB_HOST",
+    "port": "DB_PORT",
+    "user": "DB_USER",
+    "password": "DB_PASSWORD",
+    "database": "DB_NAME",
+    "pool_size": "DB_POOL_SIZE",
+    "connect_timeout": "DB_CONNECT_TIMEOUT",
+}
+
+SETTINGS_FILE = os.getenv("DB_SETTINGS_FILE", str(Path(__file__).resolve().parent / "db_settings.json"))
+
+def load_db_settings(path=SETTINGS_FILE):
+    """
+    Returns database settings merged from DEFAULTS, the JSON settings file (if it
+    exists) and DB_* environment variables, in increasing order of precedence.
+    """
+    settings = dict(DEFAULTS)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            settings.update({k: v for k, v in json.load(f).items() if k in DEFAULTS})
+    for key, var in ENV_VARS.items():
+        if var in os.environ:
+            settings[key] = os.environ[var]
+    for key in ("port", "pool_size", "connect_timeout"):
+        settings[key] = int(settings[key])
+    return settings
+
+DB_SETTINGS = load_db_settings()
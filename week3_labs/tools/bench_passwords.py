@@ -0,0 +1,67 @@
+"""
+Sizes the scrypt work factor for the login service.
+
+    python tools/bench_passwords.py --target 50 --workers 5
+
+Times hash verification for a range of N values, works out how many logins per
+second the auth thread pool could sustain at each, and recommends the largest N
+that still meets the target. Set it with the PASSWORD_SCRYPT_N environment variable.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from passwords import hash_password, verify_password
+
+def time_verify(n, rounds):
+    """Median seconds for one uncached verification at cost n."""
+    stored = hash_password("benchmark-password", n=n)
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        verify_password("benchmark-password", stored, cache=None)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def measure_throughput(n, workers, attempts):
+    """Verifications per second with `workers` threads running concurrently."""
+    stored = hash_password("benchmark-password", n=n)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda _: verify_password("benchmark-password", stored, cache=None), range(attempts)))
+    return attempts / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="scrypt work factor benchmark")
+    parser.add_argument("--target", type=float, default=50, help="required logins per second")
+    parser.add_argument("--workers", type=int, default=5, help="auth threads (the DB pool size)")
+    parser.add_argument("--min-log2", type=int, default=12)
+    parser.add_argument("--max-log2", type=int, default=17)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for log2 in range(args.min_log2, args.max_log2 + 1):
+        n = 2 ** log2
+        single = time_verify(n, args.rounds)
+        throughput = measure_throughput(n, args.workers, args.workers * args.rounds)
+        results.append({"n": n, "verify_ms": single * 1000, "logins_per_sec": throughput})
+        print(f"N=2^{log2:<3} verify {single * 1000:8.1f} ms   {throughput:8.1f} logins/s", file=sys.stderr)
+
+    meeting = [r for r in results if r["logins_per_sec"] >= args.target]
+    recommended = max(meeting, key=lambda r: r["n"])["n"] if meeting else None
+    print(json.dumps({
+        "target_logins_per_sec": args.target,
+        "workers": args.workers,
+        "results": results,
+        "recommended_n": recommended,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
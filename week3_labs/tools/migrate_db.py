@@ -0,0 +1,20 @@
+"""
+Brings the fletapp database schema up to date.
+
+    python tools/migrate_db.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from db_connection import connect_db
+from migrations import migrate
+
+if __name__ == "__main__":
+    connection = connect_db()
+    try:
+        applied = migrate(connection)
+    finally:
+        connection.close()
+    print("\n".join(f"applied {name}" for name in applied) or "schema is up to date")
@@ -0,0 +1,62 @@
+"""
+One-off migration: replaces plaintext passwords in the users table with scrypt hashes.
+
+    python tools/migrate_passwords.py            # migrate
+    python tools/migrate_passwords.py --dry-run  # only count rows
+
+Safe to re-run: rows that are already hashed are skipped. Users not migrated
+here are also upgraded on their next successful login.
+"""
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from db_connection import connect_db
+from migrations import migrate as migrate_schema
+from passwords import PREFIX, hash_password
+
+BATCH_SIZE = 500
+
+def _hash_row(row):
+    username, password = row
+    return hash_password(password), username, password
+
+def migrate(dry_run=False, workers=None):
+    connection = connect_db()
+    try:
+        if not dry_run:
+            # makes sure the password column can hold hashes
+            migrate_schema(connection)
+        cursor = connection.cursor()
+        cursor.execute("SELECT username, password FROM users WHERE password NOT LIKE %s", (PREFIX + "$%",))
+        rows = cursor.fetchall()
+        print(f"{len(rows)} plaintext passwords found")
+        if dry_run or not rows:
+            return len(rows)
+
+        # hashing is CPU bound and deliberately slow, so spread it over processes
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            updates = list(pool.map(_hash_row, rows, chunksize=16))
+        for start in range(0, len(updates), BATCH_SIZE):
+            batch = updates[start:start + BATCH_SIZE]
+            # only replace values that are still the plaintext we hashed
+            cursor.executemany(
+                "UPDATE users SET password = %s WHERE username = %s AND password = %s",
+                batch
+            )
+            connection.commit()
+            print(f"  {min(start + BATCH_SIZE, len(updates))}/{len(updates)} migrated")
+        cursor.close()
+        return len(updates)
+    finally:
+        connection.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hash plaintext passwords in the users table")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--workers", type=int, default=None, help="hashing processes (default: CPU count)")
+    args = parser.parse_args()
+    migrate(args.dry_run, args.workers)
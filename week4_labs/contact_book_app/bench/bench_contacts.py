@@ -0,0 +1,230 @@
+# bench_contacts.py
+"""
+Contact book benchmark suite. Runs headless against a temporary database and
+prints (or writes) a JSON report that can be compared between runs.
+
+    python bench/bench_contacts.py --sizes 10000 100000 --output report.json
+
+Rendering benchmarks need flet installed; without it they are reported as skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from database import ConnectionPool, add_contact_db, add_contacts_bulk_db, get_all_contacts_db
+from contact_index import ContactIndex
+from generate_contacts import generate_contacts
+
+SEARCH_TERMS = {
+    "prefix": ("mar", "jo", "kristine s"),
+    "substring": ("santos", "cruz", "a. r"),
+    "phone": ("0917", "123-4", "555"),
+}
+
+class HeadlessPage:
+    """Stands in for ft.Page when rendering the list without a window."""
+
+    def update(self):
+        pass
+
+def _timed(func, *args, repeat=5):
+    """Returns (result, median seconds) over repeat calls."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+def bench_inserts(pool, contacts, single_count):
+    """Bulk insert throughput for all contacts, and per-row add_contact_db throughput."""
+    bulk, single = contacts[:len(contacts) - single_count], contacts[len(contacts) - single_count:]
+    start = time.perf_counter()
+    for i in range(0, len(bulk), 1000):
+        pool.write(add_contacts_bulk_db, bulk[i:i + 1000])
+    bulk_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for name, phone, email in single:
+        pool.write(add_contact_db, name, phone, email)
+    single_seconds = time.perf_counter() - start
+    return {
+        "bulk_rows_per_sec": len(bulk) / bulk_seconds if bulk else None,
+        "single_rows_per_sec": len(single) / single_seconds if single else None,
+    }
+
+def bench_duplicates(pool, contacts, count):
+    """Latency of add_contact_db rejecting names that already exist."""
+    sample = contacts[::max(1, len(contacts) // count)][:count]
+    start = time.perf_counter()
+    for name, phone, email in sample:
+        assert not pool.write(add_contact_db, name.upper(), phone, email)
+    seconds = time.perf_counter() - start
+    return {"checks": len(sample), "avg_us": seconds / len(sample) * 1e6}
+
+def _prefix_contacts_db(conn, prefix):
+    # A range on the LOWER(name) index, so the SQLite side of the "prefix" timing is a
+    # real prefix lookup like ContactIndex.prefix, not a LIKE '%q%' substring scan.
+    low = prefix.lower()
+    high = low[:-1] + chr(ord(low[-1]) + 1)
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, name, phone, email FROM contacts "
+        "WHERE LOWER(name) >= ? AND LOWER(name) < ? AND deleted_at IS NULL ORDER BY LOWER(name)",
+        (low, high),
+    )
+    return cur.fetchall()
+
+def bench_search(pool, index):
+    """Median latency per query kind, through SQLite LIKE and through the in-memory index."""
+    report = {}
+    for kind, terms in SEARCH_TERMS.items():
+        db_times, index_times, hits = [], [], []
+        for term in terms:
+            if kind != "phone":
+                # the SQL search only covers names
+                query = _prefix_contacts_db if kind == "prefix" else get_all_contacts_db
+                _, seconds = _timed(pool.read, query, term)
+                db_times.append(seconds)
+            rows, seconds = _timed(index.prefix if kind == "prefix" else index.search, term)
+            index_times.append(seconds)
+            hits.append(len(rows))
+        report[kind] = {
+            "sqlite_median_us": statistics.median(db_times) * 1e6 if db_times else None,
+            "index_median_us": statistics.median(index_times) * 1e6,
+            "avg_hits": statistics.mean(hits),
+        }
+    return report
+
+def _traced_bytes(build):
+    """Bytes still allocated after build() returns, measured with tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del kept
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+
+def bench_row_overhead(pool):
+    """
+    Per-row memory of the row data and click handlers that each card keeps alive:
+    plain tuples with two lambdas per row versus Contact rows with one shared handler.
+    Needs no flet, so it also runs where rendering is skipped.
+    """
+    page = db = list_view = index = object()
+
+    def open_edit(*args):
+        pass
+
+    def tuples_with_closures():
+        rows = pool.read(lambda conn: conn.execute("SELECT id, name, phone, email FROM contacts").fetchall())
+        return [
+            (contact,
+             lambda _, c=contact: open_edit(page, c, db, list_view),
+             lambda _, cid=contact[0]: open_edit(page, cid, db, list_view))
+            for contact in rows
+        ]
+
+    def contacts_with_shared_handler():
+        rows = pool.read(get_all_contacts_db)
+        handler = lambda e: open_edit(page, index.get(e.control.data), db, list_view)
+        return [(contact, handler, handler) for contact in rows]
+
+    rows = len(pool.read(get_all_contacts_db))
+    before = _traced_bytes(tuples_with_closures) / rows
+    after = _traced_bytes(contacts_with_shared_handler) / rows
+    return {
+        "tuple_closures_bytes_per_row": before,
+        "contact_shared_handler_bytes_per_row": after,
+        "saved_pct": (1 - after / before) * 100 if before else None,
+    }
+
+def bench_render(pool, index):
+    """Full list render time and memory retained per rendered contact."""
+    try:
+        import flet as ft
+        from app_logic import display_contacts
+    except ImportError as ex:
+        return {"skipped": f"flet not available ({ex})"}
+
+    page = HeadlessPage()
+    list_view = ft.ListView()
+    start = time.perf_counter()
+    display_contacts(page, list_view, pool, index)
+    seconds = time.perf_counter() - start
+
+    list_view.controls.clear()
+
+    def render():
+        display_contacts(page, list_view, pool, index)
+
+    retained = _traced_bytes(render)
+    rendered = len(list_view.controls)
+    return {
+        "rendered": rendered,
+        "seconds": seconds,
+        "bytes_per_contact": retained / rendered if rendered else None,
+    }
+
+def run_size(size, seed, single_count, duplicate_count):
+    contacts = list(generate_contacts(size, seed))
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, "bench.db"))
+        try:
+            result = {"inserts": bench_inserts(pool, contacts, min(single_count, size))}
+            result["duplicates"] = bench_duplicates(pool, contacts, min(duplicate_count, size))
+            start = time.perf_counter()
+            index = ContactIndex(pool.read(get_all_contacts_db))
+            result["index_load_seconds"] = time.perf_counter() - start
+            result["search"] = bench_search(pool, index)
+            result["row_overhead"] = bench_row_overhead(pool)
+            result["render"] = bench_render(pool, index)
+        finally:
+            pool.close()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Contact book benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--single-inserts", type=int, default=1000,
+                        help="rows inserted one at a time through add_contact_db")
+    parser.add_argument("--duplicate-checks", type=int, default=1000)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+    for size in args.sizes:
+        print(f"benchmarking {size} contacts...", file=sys.stderr)
+        report["sizes"][str(size)] = run_size(size, args.seed, args.single_inserts, args.duplicate_checks)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
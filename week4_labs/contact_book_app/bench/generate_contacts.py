@@ -0,0 +1,67 @@
+# generate_contacts.py
+"""
+Synthetic contact generator for benchmarks.
+
+    python bench/generate_contacts.py 100000 contacts.csv
+    python bench/generate_contacts.py 10000 contacts.vcf --seed 7
+"""
+import argparse
+import csv
+import random
+from pathlib import Path
+
+FIRST_NAMES = (
+    "Maria", "Jose", "Juan", "Ana", "Mark", "John", "Michael", "Angel", "Jasmine", "Carlo",
+    "Kristine", "Paolo", "Andrea", "Miguel", "Patricia", "Joshua", "Nicole", "Gabriel",
+    "Camille", "Rafael", "Bea", "Daniel", "Erika", "Christian", "Sofia", "Vincent", "Trisha",
+    "Adrian", "Janelle", "Francis", "Liza", "Ramon", "Grace", "Kevin", "Isabel", "Noel",
+    "Emma", "Liam", "Olivia", "Noah", "Ava", "Ethan", "Mia", "Lucas", "Chloe", "Mateo",
+)
+LAST_NAMES = (
+    "Santos", "Reyes", "Cruz", "Bautista", "Garcia", "Mendoza", "Torres", "Flores", "Ramos",
+    "Castillo", "Villanueva", "Aquino", "Navarro", "Morales", "Gonzales", "Dela Cruz",
+    "Fernandez", "Lopez", "Aguilar", "Rivera", "Pascual", "Domingo", "Salazar", "Mercado",
+    "Soriano", "Morandarte", "Del Rosario", "Valdez", "Castro", "Smith", "Johnson", "Brown",
+    "Williams", "Lee", "Tan", "Lim", "Chua", "Go", "Sy", "Ong",
+)
+MIDDLE_INITIALS = "ABCDEFGHIJKLMNOPRSTV"
+DOMAINS = ("gmail.com", "yahoo.com", "outlook.com", "school.edu.ph", "example.com")
+
+def generate_contacts(count, seed=42):
+    """
+    Yields count (name, phone, email) tuples with unique names.
+    Output is deterministic for a given seed.
+    """
+    rng = random.Random(seed)
+    seen = set()
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        name = f"{first} {rng.choice(MIDDLE_INITIALS)}. {last}"
+        if name.lower() in seen:
+            name = f"{name} {i}"
+        seen.add(name.lower())
+        phone = f"09{rng.randint(10, 99)}-{rng.randint(0, 999):03d}-{rng.randint(0, 9999):04d}"
+        local = f"{first}.{last}".lower().replace(" ", "")
+        email = f"{local}{rng.randint(1, 9999)}@{rng.choice(DOMAINS)}"
+        yield (name, phone, email)
+
+def write_contacts(path, count, seed=42):
+    """Writes generated contacts to a CSV or vCard file, chosen by extension."""
+    path = Path(path)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.suffix.lower() == ".csv":
+            writer = csv.writer(f)
+            writer.writerow(("name", "phone", "email"))
+            writer.writerows(generate_contacts(count, seed))
+        else:
+            for name, phone, email in generate_contacts(count, seed):
+                f.write(f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:{name}\r\nTEL:{phone}\r\nEMAIL:{email}\r\nEND:VCARD\r\n")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic contacts")
+    parser.add_argument("count", type=int)
+    parser.add_argument("output", help="output .csv or .vcf file")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    write_contacts(args.output, args.count, args.seed)
@@ -1,23 +1,134 @@
 # app_logic.py
+import asyncio
 import flet as ft
-from database import update_contact_db, delete_contact_db, add_contact_db, get_all_contacts_db
+from database import (
+    update_contact_db, add_contact_db, get_all_contacts_db, soft_delete_contacts_db,
+    restore_contacts_db, update_contacts_bulk_db, purge_deleted_contacts_db,
+    get_last_change_seq_db, get_changes_since_db,
+)
+from import_export import import_contacts, export_contacts
 
-def _show_snack(page, text, bgcolor=None):
+PURGE_INTERVAL_SECONDS = 10 * 60
+SYNC_INTERVAL_SECONDS = 1.0
+
+def _show_snack(page, text, bgcolor=None, action=None, on_action=None):
     sb = ft.SnackBar(
         ft.Text(text),
         bgcolor=bgcolor or ft.colors.BLACK,
         open=True,
-        duration=2000
+        duration=5000 if action else 2000,
+        action=action,
+        on_action=on_action
     )
     page.snack_bar = sb
     page.update()
 
-def display_contacts(page, contacts_list_view, db_conn, search_term=""):
-    """Fetches and displays all contacts in the ListView."""
+class Selection:
+    """
+    Ids of the contacts ticked in the list. Kept in the list view's `data` so it
+    survives re-renders; on_change is called whenever the selection changes.
+    """
+
+    def __init__(self, on_change=None):
+        self.ids = set()
+        self.on_change = on_change
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    def set(self, contact_id, selected):
+        if selected:
+            self.ids.add(contact_id)
+        else:
+            self.ids.discard(contact_id)
+        self._changed()
+
+    def discard(self, contact_ids):
+        self.ids.difference_update(contact_ids)
+        self._changed()
+
+    def clear(self):
+        self.ids.clear()
+        self._changed()
+
+async def _reload_index(db, index):
+    # read the change-log position first: changes racing with the load are replayed, harmlessly
+    seq = await db.read(get_last_change_seq_db)
+    index.reload(await db.read(get_all_contacts_db))
+    index.seq = seq
+
+async def load_contacts(page, contacts_list_view, db, index):
+    """Loads all contacts from the database into the search index and displays them."""
+    await _reload_index(db, index)
+    display_contacts(page, contacts_list_view, db, index)
+
+async def sync_contacts(page, contacts_list_view, db, index, search_field, interval=SYNC_INTERVAL_SECONDS):
+    """
+    Background job that keeps this window in step with edits made by other windows or
+    users of the same database. Polls the change log for entries after index.seq and
+    applies them to the index, re-rendering only if something visible changed.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        changes = await db.read(get_changes_since_db, index.seq)
+        if changes is None:
+            # log was purged past our position: fall back to a full reload
+            await _reload_index(db, index)
+            display_contacts(page, contacts_list_view, db, index, search_field.value)
+            continue
+        dirty = False
+        removed = []
+        for seq, contact_id, contact in changes:
+            index.seq = seq
+            if contact is None:
+                if contact_id in index:
+                    index.remove(contact_id)
+                    removed.append(contact_id)
+                    dirty = True
+            elif index.get(contact_id) != contact:
+                # our own writes are already in the index and compare equal
+                index.update(contact)
+                dirty = True
+        if removed and isinstance(contacts_list_view.data, Selection):
+            contacts_list_view.data.discard(removed)
+        if dirty:
+            display_contacts(page, contacts_list_view, db, index, search_field.value)
+
+# Shared by every contact card instead of being rebuilt per row
+CARD_MARGIN = ft.margin.symmetric(vertical=6, horizontal=8)
+CARD_SHAPE = ft.RoundedRectangleBorder(radius=8)
+MENU_EDIT = "Edit"
+MENU_DELETE = "Delete"
+
+def _contact_menu_handler(page, contacts_list_view, db, index):
+    """
+    Builds the single click handler shared by all contact menu items.
+    Items carry the contact id in `data`; the handler looks the contact up in the index.
+    """
+    def on_menu_click(e):
+        contact = index.get(e.control.data)
+        if contact is None:
+            return
+        if e.control.text == MENU_EDIT:
+            open_edit_dialog(page, contact, db, index, contacts_list_view)
+        else:
+            confirm_delete(page, contact.id, db, index, contacts_list_view)
+    return on_menu_click
+
+def display_contacts(page, contacts_list_view, db, index, search_term=""):
+    """
+    Displays the contacts matching search_term (name, phone or email) from the in-memory index.
+    If contacts_list_view.data holds a Selection, each card gets a checkbox bound to it.
+    """
+    contacts = index.search(search_term)
     contacts_list_view.controls.clear()
-    contacts = get_all_contacts_db(db_conn, search_term)
+    on_menu_click = _contact_menu_handler(page, contacts_list_view, db, index)
+    selection = contacts_list_view.data if isinstance(contacts_list_view.data, Selection) else None
+    if selection:
+        on_select = lambda e: selection.set(e.control.data, e.control.value)
     for contact in contacts:
-        contact_id, name, phone, email = contact
+        name = contact.name
         # avatar initial
         initial = (name.strip()[0].upper() if name and name.strip() else "?")
         avatar = ft.CircleAvatar(content=ft.Text(initial, color=ft.Colors.WHITE, weight=ft.FontWeight.BOLD),
@@ -25,9 +136,13 @@ def display_contacts(page, contacts_list_view, db_conn, search_term=""):
 
         left_col = ft.Column(
             [
-                ft.Row([avatar, ft.Column([ft.Text(name, size=16, weight=ft.FontWeight.BOLD)], tight=True)], alignment=ft.MainAxisAlignment.START, spacing=12),
-                ft.Row([ft.Icon(ft.Icons.PHONE, size=16), ft.Text(phone or "-", size=12)], alignment=ft.MainAxisAlignment.START),
-                ft.Row([ft.Icon(ft.Icons.EMAIL, size=16), ft.Text(email or "-", size=12)], alignment=ft.MainAxisAlignment.START),
+                ft.Row(
+                    ([ft.Checkbox(value=contact.id in selection.ids, data=contact.id, on_change=on_select)] if selection else [])
+                    + [avatar, ft.Column([ft.Text(name, size=16, weight=ft.FontWeight.BOLD)], tight=True)],
+                    alignment=ft.MainAxisAlignment.START, spacing=12
+                ),
+                ft.Row([ft.Icon(ft.Icons.PHONE, size=16), ft.Text(contact.phone or "-", size=12)], alignment=ft.MainAxisAlignment.START),
+                ft.Row([ft.Icon(ft.Icons.EMAIL, size=16), ft.Text(contact.email or "-", size=12)], alignment=ft.MainAxisAlignment.START),
             ],
             tight=True
         )
@@ -35,17 +150,9 @@ def display_contacts(page, contacts_list_view, db_conn, search_term=""):
         menu = ft.PopupMenuButton(
             icon=ft.Icons.MORE_VERT,
             items=[
-                ft.PopupMenuItem(
-                    text="Edit",
-                    icon=ft.Icons.EDIT,
-                    on_click=lambda _, c=contact: open_edit_dialog(page, c, db_conn, contacts_list_view)
-                ),
+                ft.PopupMenuItem(text=MENU_EDIT, icon=ft.Icons.EDIT, data=contact.id, on_click=on_menu_click),
                 ft.PopupMenuItem(),
-                ft.PopupMenuItem(
-                    text="Delete",
-                    icon=ft.Icons.DELETE,
-                    on_click=lambda _, cid=contact_id: confirm_delete(page, cid, db_conn, contacts_list_view)
-                ),
+                ft.PopupMenuItem(text=MENU_DELETE, icon=ft.Icons.DELETE, data=contact.id, on_click=on_menu_click),
             ],
         )
 
@@ -55,14 +162,14 @@ def display_contacts(page, contacts_list_view, db_conn, search_term=""):
                 content=ft.Row([left_col, menu], alignment=ft.MainAxisAlignment.SPACE_BETWEEN),
             ),
             elevation=2,
-            margin=ft.margin.symmetric(vertical=6, horizontal=8),
-            shape=ft.RoundedRectangleBorder(radius=8)
+            margin=CARD_MARGIN,
+            shape=CARD_SHAPE
         )
         contacts_list_view.controls.append(card)
 
     page.update()
 
-def add_contact(page, inputs, contacts_list_view, db_conn, search_field):
+async def add_contact(page, inputs, contacts_list_view, db, index, search_field):
     """Adds a new contact and refreshes the list with validation and duplicate check."""
     name_input, phone_input, email_input = inputs
     valid = True
@@ -90,12 +197,14 @@ def add_contact(page, inputs, contacts_list_view, db_conn, search_field):
         page.update()
         return
 
-    # attempt to insert; add_contact_db returns False if duplicate
-    inserted = add_contact_db(db_conn, name_input.value.strip(), phone_input.value.strip(), email_input.value.strip())
-    if not inserted:
+    # attempt to insert; add_contact_db returns None if duplicate
+    name, phone, email = name_input.value.strip(), phone_input.value.strip(), email_input.value.strip()
+    contact_id = await db.write(add_contact_db, name, phone, email)
+    if not contact_id:
         name_input.error_text = "Contact name already exists"
         page.update()
         return
+    index.add((contact_id, name, phone, email))
 
     # clear fields
     for field in inputs:
@@ -105,19 +214,36 @@ def add_contact(page, inputs, contacts_list_view, db_conn, search_field):
     # show success snackbar
     _show_snack(page, "Contact added", bgcolor=ft.Colors.GREEN)
 
-    display_contacts(page, contacts_list_view, db_conn, search_field.value)
-    page.update()
+    display_contacts(page, contacts_list_view, db, index, search_field.value)
+
+async def delete_contacts(page, contact_ids, db, index, contacts_list_view, search_term=""):
+    """Soft-deletes contacts in one transaction, refreshes the list and offers Undo."""
+    contact_ids = list(contact_ids)
+    deleted = await db.write(soft_delete_contacts_db, contact_ids)
+    for contact_id in contact_ids:
+        index.remove(contact_id)
+    selection = contacts_list_view.data
+    if isinstance(selection, Selection):
+        selection.discard(contact_ids)
 
-def delete_contact(page, contact_id, db_conn, contacts_list_view, search_term=""):
+    async def undo(e):
+        for contact in await db.write(restore_contacts_db, contact_ids):
+            index.add(contact)
+        _show_snack(page, "Delete undone", bgcolor=ft.Colors.GREEN)
+        display_contacts(page, contacts_list_view, db, index, search_term)
+
+    text = "Contact deleted" if deleted == 1 else f"{deleted} contacts deleted"
+    _show_snack(page, text, bgcolor=ft.Colors.ORANGE, action="Undo", on_action=undo)
+    display_contacts(page, contacts_list_view, db, index, search_term)
+
+async def delete_contact(page, contact_id, db, index, contacts_list_view, search_term=""):
     """Deletes a contact and refreshes the list."""
-    delete_contact_db(db_conn, contact_id)
-    _show_snack(page, "Contact deleted", bgcolor=ft.Colors.ORANGE)
-    display_contacts(page, contacts_list_view, db_conn, search_term)
+    await delete_contacts(page, [contact_id], db, index, contacts_list_view, search_term)
 
-def confirm_delete(page, contact_id, db_conn, contacts_list_view):
+def confirm_delete(page, contact_id, db, index, contacts_list_view):
     """Asks for confirmation before deleting a contact."""
-    def yes_action(e):
-        delete_contact(page, contact_id, db_conn, contacts_list_view)
+    async def yes_action(e):
+        await delete_contact(page, contact_id, db, index, contacts_list_view)
         dialog.open = False
         page.update()
     def no_action(e):
@@ -137,7 +263,7 @@ def confirm_delete(page, contact_id, db_conn, contacts_list_view):
     )
     page.open(dialog)
 
-def open_edit_dialog(page, contact, db_conn, contacts_list_view):
+def open_edit_dialog(page, contact, db, index, contacts_list_view):
     """Opens a dialog to edit a contact's details with validation and duplicate-name handling."""
     contact_id, name, phone, email = contact
     edit_name = ft.TextField(label="Name", value=name, width=320)
@@ -157,23 +283,25 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
                 f.border_color = ft.Colors.BLACK
     apply_edit_colors()
 
-    def save_and_close(e):
+    async def save_and_close(e):
         if not edit_name.value.strip():
             edit_name.error_text = "Name cannot be empty"
             page.update()
             return
         edit_name.error_text = None
 
-        success = update_contact_db(db_conn, contact_id, edit_name.value.strip(), edit_phone.value.strip(), edit_email.value.strip())
+        updated = (contact_id, edit_name.value.strip(), edit_phone.value.strip(), edit_email.value.strip())
+        success = await db.write(update_contact_db, *updated)
         if not success:
             edit_name.error_text = "Another contact with this name exists"
             page.update()
             return
+        index.update(updated)
 
         dialog.open = False
         _show_snack(page, "Contact updated", bgcolor=ft.Colors.GREEN)
         page.update()
-        display_contacts(page, contacts_list_view, db_conn)
+        display_contacts(page, contacts_list_view, db, index)
 
     dialog_content = ft.Container(
         content=ft.Column([edit_name, edit_phone, edit_email], tight=True),
@@ -192,3 +320,105 @@ def open_edit_dialog(page, contact, db_conn, contacts_list_view):
     )
 
     page.open(dialog)
+
+async def import_contacts_file(page, path, contacts_list_view, db, index, search_field, status_text):
+    """Imports contacts from a CSV/vCard file, reporting progress in status_text."""
+    def progress(processed):
+        status_text.value = f"Importing... {processed} records processed"
+        page.update()
+
+    status_text.visible = True
+    try:
+        result = await db.write(import_contacts, path, progress=progress)
+    except (OSError, ValueError, UnicodeDecodeError) as ex:
+        status_text.visible = False
+        _show_snack(page, f"Import failed: {ex}", bgcolor=ft.Colors.RED)
+        return
+    status_text.visible = False
+    _show_snack(
+        page,
+        f"Imported {result['imported']} contacts "
+        f"({result['duplicates']} duplicates, {result['invalid']} invalid skipped)",
+        bgcolor=ft.Colors.GREEN
+    )
+    await _reload_index(db, index)
+    display_contacts(page, contacts_list_view, db, index, search_field.value)
+
+async def export_contacts_file(page, path, db):
+    """Exports all contacts to a CSV/vCard file chosen by its extension."""
+    try:
+        count = await db.read(export_contacts, path)
+    except (OSError, ValueError) as ex:
+        _show_snack(page, f"Export failed: {ex}", bgcolor=ft.Colors.RED)
+        return
+    _show_snack(page, f"Exported {count} contacts", bgcolor=ft.Colors.GREEN)
+
+def confirm_bulk_delete(page, db, index, contacts_list_view, search_term=""):
+    """Asks for confirmation, then deletes all selected contacts in one transaction."""
+    selection = contacts_list_view.data
+    if not selection.ids:
+        return
+    contact_ids = list(selection.ids)
+
+    async def yes_action(e):
+        dialog.open = False
+        await delete_contacts(page, contact_ids, db, index, contacts_list_view, search_term)
+    def no_action(e):
+        dialog.open = False
+        page.update()
+    dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text("Confirm Delete"),
+        content=ft.Text(f"Are you sure you want to delete {len(contact_ids)} selected contacts?"),
+        actions=[
+            ft.TextButton("No", on_click=no_action),
+            ft.TextButton(
+                content=ft.Text("Yes", color=ft.Colors.RED),
+                on_click=yes_action
+            ),
+        ],
+    )
+    page.open(dialog)
+
+def open_bulk_edit_dialog(page, db, index, contacts_list_view, search_term=""):
+    """Opens a dialog to set phone and/or email on all selected contacts in one transaction."""
+    selection = contacts_list_view.data
+    if not selection.ids:
+        return
+    contact_ids = list(selection.ids)
+    edit_phone = ft.TextField(label="Phone", hint_text="Leave empty to keep", width=320)
+    edit_email = ft.TextField(label="Email", hint_text="Leave empty to keep", width=320)
+
+    async def save_and_close(e):
+        phone = edit_phone.value.strip() or None
+        email = edit_email.value.strip() or None
+        dialog.open = False
+        if phone is None and email is None:
+            page.update()
+            return
+        for contact in await db.write(update_contacts_bulk_db, contact_ids, phone=phone, email=email):
+            index.update(contact)
+        selection.clear()
+        _show_snack(page, f"{len(contact_ids)} contacts updated", bgcolor=ft.Colors.GREEN)
+        display_contacts(page, contacts_list_view, db, index, search_term)
+
+    dialog = ft.AlertDialog(
+        modal=True,
+        title=ft.Text(f"Edit {len(contact_ids)} Contacts"),
+        content=ft.Container(
+            content=ft.Column([edit_phone, edit_email], tight=True),
+            padding=16,
+            width=420
+        ),
+        actions=[
+            ft.TextButton("Cancel", on_click=lambda e: setattr(dialog, 'open', False) or page.update()),
+            ft.TextButton("Save", on_click=save_and_close),
+        ]
+    )
+    page.open(dialog)
+
+async def purge_deleted_contacts(db, interval=PURGE_INTERVAL_SECONDS):
+    """Background job: periodically removes soft-deleted contacts past their undo window."""
+    while True:
+        await db.write(purge_deleted_contacts_db)
+        await asyncio.sleep(interval)
@@ -0,0 +1,130 @@
+# contact_index.py
+from bisect import bisect_left, insort
+from collections import defaultdict
+from database import Contact
+
+GRAM_SIZE = 3
+
+def _grams(text):
+    """Returns the set of GRAM_SIZE-character substrings of text."""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+def _fields(contact):
+    """Casefolded searchable fields of a contact: name, phone, email and phone digits."""
+    _, name, phone, email = contact
+    phone = phone or ""
+    digits = "".join(ch for ch in phone if ch.isdigit())
+    return (name.casefold(), phone.casefold(), (email or "").casefold(), digits)
+
+class ContactIndex:
+    """
+    In-memory search index over contacts, loaded once from the database and then
+    kept up to date with add/update/remove as the app changes contacts.
+    Holds a sorted array of casefolded names (for ordering and prefix lookups) and a
+    trigram index over name, phone and email (for substring lookups), so searching
+    never touches SQLite. The database stays the source of truth.
+    `seq` is the last change-log sequence number reflected in the index.
+    """
+
+    def __init__(self, contacts=(), seq=0):
+        self.seq = seq
+        self.reload(contacts)
+
+    def reload(self, contacts):
+        """Replaces the index contents with the given (id, name, phone, email) rows."""
+        self._contacts = {}
+        self._haystacks = {}
+        self._texts = {}
+        self._grams = defaultdict(set)
+        keys = []
+        for contact in contacts:
+            self._index(contact)
+            keys.append((self._haystacks[contact[0]][0], contact[0]))
+        keys.sort()
+        self._keys = keys
+
+    def __len__(self):
+        return len(self._contacts)
+
+    def __contains__(self, contact_id):
+        return contact_id in self._contacts
+
+    def get(self, contact_id):
+        return self._contacts.get(contact_id)
+
+    def _index(self, contact):
+        contact_id = contact[0]
+        fields = _fields(contact)
+        self._contacts[contact_id] = Contact._make(contact)
+        self._haystacks[contact_id] = fields
+        # all fields joined, so a substring check is a single `in`
+        self._texts[contact_id] = "\0".join(fields)
+        for field in fields:
+            for gram in _grams(field):
+                self._grams[gram].add(contact_id)
+
+    def _unindex(self, contact_id):
+        fields = self._haystacks.pop(contact_id)
+        del self._contacts[contact_id]
+        del self._texts[contact_id]
+        for field in fields:
+            for gram in _grams(field):
+                ids = self._grams[gram]
+                ids.discard(contact_id)
+                if not ids:
+                    del self._grams[gram]
+        key = (fields[0], contact_id)
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            del self._keys[pos]
+
+    def add(self, contact):
+        """Adds an (id, name, phone, email) row, replacing any row with the same id."""
+        if contact[0] in self._contacts:
+            self._unindex(contact[0])
+        self._index(contact)
+        insort(self._keys, (self._haystacks[contact[0]][0], contact[0]))
+
+    update = add
+
+    def remove(self, contact_id):
+        """Removes a contact by id; unknown ids are ignored."""
+        if contact_id in self._contacts:
+            self._unindex(contact_id)
+
+    def _sorted(self, ids):
+        return sorted((self._contacts[i] for i in ids), key=lambda c: (self._haystacks[c[0]][0], c[0]))
+
+    def prefix(self, term):
+        """Returns contacts whose name starts with term, sorted by name."""
+        term = term.casefold()
+        keys = self._keys
+        pos = bisect_left(keys, (term,))
+        result = []
+        while pos < len(keys) and keys[pos][0].startswith(term):
+            result.append(self._contacts[keys[pos][1]])
+            pos += 1
+        return result
+
+    def search(self, term=""):
+        """
+        Returns contacts whose name, phone or email contains term (case-insensitive),
+        sorted by name. An empty term returns every contact.
+        """
+        term = (term or "").strip().casefold()
+        if not term:
+            return [self._contacts[contact_id] for _, contact_id in self._keys]
+        if len(term) < GRAM_SIZE:
+            texts = self._texts
+            return [self._contacts[contact_id] for _, contact_id in self._keys if term in texts[contact_id]]
+        # intersect the posting sets, smallest first, then confirm the full substring
+        postings = sorted((self._grams.get(gram, ()) for gram in _grams(term)), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates &= ids
+            if not candidates:
+                return []
+        texts = self._texts
+        return self._sorted(contact_id for contact_id in candidates if term in texts[contact_id])
@@ -1,63 +1,318 @@
 # database.py
+import asyncio
+import functools
+import logging
+import queue
 import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 
-def init_db():
-    """Initializes DB and ensures contacts table exists."""
-    conn = sqlite3.connect("contacts.db", check_same_thread=False)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            phone TEXT,
-            email TEXT
-        )
-        """
+logger = logging.getLogger(__name__)
+
+DB_PATH = "contacts.db"
+
+# Row model for contacts. A namedtuple has no per-instance __dict__, so it costs
+# the same as the plain row tuple while allowing contact.name style access.
+Contact = namedtuple("Contact", ("id", "name", "phone", "email"))
+
+def _contact_row(cursor, row):
+    return Contact._make(row)
+
+# Connection settings applied to every connection
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",      # ~16 MB page cache
+    "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Schema migrations, applied in order. PRAGMA user_version stores how many have run.
+# Append new steps to the end; never edit or reorder existing ones.
+MIGRATIONS = (
+    # 1: contacts table
+    """
+    CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        phone TEXT,
+        email TEXT
     )
-    conn.commit()
+    """,
+    # 2: case-insensitive name lookups, duplicate checks and ordering
+    "CREATE INDEX IF NOT EXISTS idx_contacts_name_lower ON contacts (LOWER(name))",
+    # 3: soft delete tombstones (deleted_at is a unix timestamp, NULL for live contacts)
+    """
+    ALTER TABLE contacts ADD COLUMN deleted_at REAL;
+    CREATE INDEX IF NOT EXISTS idx_contacts_deleted_at ON contacts (deleted_at) WHERE deleted_at IS NOT NULL
+    """,
+    # 4: change log written by triggers, read by other sessions to sync incrementally
+    """
+    CREATE TABLE IF NOT EXISTS contact_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        contact_id INTEGER NOT NULL,
+        changed_at REAL NOT NULL DEFAULT (strftime('%s', 'now'))
+    );
+    CREATE TRIGGER IF NOT EXISTS contacts_log_insert AFTER INSERT ON contacts
+    BEGIN
+        INSERT INTO contact_changes (contact_id) VALUES (NEW.id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS contacts_log_update AFTER UPDATE ON contacts
+    BEGIN
+        INSERT INTO contact_changes (contact_id) VALUES (NEW.id);
+    END;
+    CREATE TRIGGER IF NOT EXISTS contacts_log_delete AFTER DELETE ON contacts
+    BEGIN
+        INSERT INTO contact_changes (contact_id) VALUES (OLD.id);
+    END
+    """,
+)
+
+# Tombstones and change-log entries older than this are removed by purge_deleted_contacts_db
+PURGE_AFTER_SECONDS = 24 * 60 * 60
+
+def connect(path=DB_PATH, check_same_thread=True):
+    """Opens a connection to the contacts database with the performance PRAGMAs applied."""
+    conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
     return conn
 
+def migrate(conn):
+    """Applies any pending MIGRATIONS. Returns the resulting schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, statement in enumerate(MIGRATIONS[version:], start=version + 1):
+        with conn:
+            conn.executescript(f"BEGIN; {statement}; PRAGMA user_version = {number}; COMMIT;")
+    return max(version, len(MIGRATIONS))
+
+class ConnectionPool:
+    """
+    Thread-safe access to the contacts database.
+    All writes go through one writer connection owned by a background thread and
+    are executed in order from a queue. Reads use a separate connection per
+    calling thread, so in WAL mode they run in parallel with writes.
+    Database functions below take a connection as their first argument and are
+    run with pool.read(func, ...) or pool.write(func, ...).
+    """
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()
+        self._writes = queue.Queue()
+        writer_conn = connect(path, check_same_thread=False)
+        migrate(writer_conn)
+        self._writer = threading.Thread(
+            target=self._write_loop, args=(writer_conn,), name="contacts-db-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _write_loop(self, conn):
+        while True:
+            job = self._writes.get()
+            if job is None:
+                break
+            func, args, kwargs, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(conn, *args, **kwargs))
+            except BaseException as ex:
+                if conn.in_transaction:
+                    conn.rollback()
+                future.set_exception(ex)
+        conn.close()
+
+    def _reader(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def read(self, func, *args, **kwargs):
+        """Runs func(conn, *args, **kwargs) on this thread's reader connection."""
+        return func(self._reader(), *args, **kwargs)
+
+    def submit_write(self, func, *args, **kwargs):
+        """Queues func(conn, *args, **kwargs) for the writer connection and returns a Future."""
+        future = Future()
+        self._writes.put((func, args, kwargs, future))
+        return future
+
+    def write(self, func, *args, **kwargs):
+        """Runs func on the writer connection and waits for its result."""
+        return self.submit_write(func, *args, **kwargs).result()
+
+    def close(self):
+        """Stops the writer thread after pending writes and closes all connections."""
+        self._writes.put(None)
+        self._writer.join()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
+
+class QueryMetrics:
+    """
+    Metrics hook for AsyncDB that keeps count/total/max timings per query function
+    and logs queries slower than slow_threshold seconds.
+    """
+
+    def __init__(self, slow_threshold=0.1):
+        self.slow_threshold = slow_threshold
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, name, kind, seconds):
+        with self._lock:
+            count, total, worst = self.stats.get(name, (0, 0.0, 0.0))
+            self.stats[name] = (count + 1, total + seconds, max(worst, seconds))
+        if seconds >= self.slow_threshold:
+            logger.warning("slow %s %s: %.1f ms", kind, name, seconds * 1000)
+
+    def summary(self):
+        """Returns {name: {"count", "avg_ms", "max_ms"}} for every recorded query."""
+        with self._lock:
+            return {
+                name: {"count": count, "avg_ms": total / count * 1000, "max_ms": worst * 1000}
+                for name, (count, total, worst) in self.stats.items()
+            }
+
+class AsyncDB:
+    """
+    Awaitable facade over ConnectionPool so async Flet handlers never block on SQLite.
+    Reads run on a dedicated thread pool (each worker keeps its own reader connection),
+    writes are awaited on the pool's writer queue. Every call is timed and reported to
+    metrics_hook(name, kind, seconds) if one is given.
+    """
+
+    def __init__(self, pool, max_readers=4, metrics_hook=None):
+        self.pool = pool
+        self.metrics_hook = metrics_hook
+        self._executor = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="contacts-db-reader")
+
+    def _report(self, func, kind, start):
+        if self.metrics_hook:
+            name = getattr(func, "__name__", repr(func))
+            self.metrics_hook(name, kind, time.perf_counter() - start)
+
+    async def read(self, func, *args, **kwargs):
+        """Runs func(conn, *args, **kwargs) on a reader thread and returns its result."""
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, functools.partial(self.pool.read, func, *args, **kwargs)
+            )
+        finally:
+            self._report(func, "read", start)
+
+    async def write(self, func, *args, **kwargs):
+        """Runs func(conn, *args, **kwargs) on the writer connection and returns its result."""
+        start = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self.pool.submit_write(func, *args, **kwargs))
+        finally:
+            self._report(func, "write", start)
+
+    def close(self):
+        """Waits for in-flight reads, then closes the underlying pool."""
+        self._executor.shutdown(wait=True)
+        self.pool.close()
+
+def init_db(path=DB_PATH):
+    """Opens the contacts database, brings its schema up to date and returns a ConnectionPool."""
+    return ConnectionPool(path)
+
 def add_contact_db(conn, name, phone, email):
     """
     Adds a new contact.
-    Returns True on success, False if a contact with the same name exists.
+    Returns the new contact's id on success, None if a contact with the same name exists.
     """
     cur = conn.cursor()
     # Simple duplicate-name check (name uniqueness enforced by DB too)
-    cur.execute("SELECT 1 FROM contacts WHERE LOWER(name) = LOWER(?)", (name.strip(),))
+    cur.execute("SELECT 1 FROM contacts WHERE LOWER(name) = LOWER(?) AND deleted_at IS NULL", (name.strip(),))
     if cur.fetchone():
-        return False
+        return None
+    # a deleted contact with the same name would still hold the UNIQUE name
+    _purge_tombstones_named(cur, [name.strip()])
     cur.execute(
         "INSERT INTO contacts (name, phone, email) VALUES (?, ?, ?)",
         (name.strip(), phone.strip(), email.strip())
     )
     conn.commit()
-    return True
+    return cur.lastrowid
 
 def get_all_contacts_db(conn, search_term=""):
     """
-    Retrieves all contacts sorted alphabetically by name.
+    Retrieves all contacts as Contact rows sorted alphabetically by name.
     If search_term provided, filters by name.
     """
     cur = conn.cursor()
+    cur.row_factory = _contact_row
     if search_term:
         cur.execute(
-            "SELECT id, name, phone, email FROM contacts WHERE name LIKE ? ORDER BY LOWER(name)",
+            "SELECT id, name, phone, email FROM contacts WHERE deleted_at IS NULL AND name LIKE ? "
+            "ORDER BY LOWER(name)",
             (f"%{search_term}%",)
         )
     else:
-        cur.execute("SELECT id, name, phone, email FROM contacts ORDER BY LOWER(name)")
+        cur.execute("SELECT id, name, phone, email FROM contacts WHERE deleted_at IS NULL ORDER BY LOWER(name)")
     return cur.fetchall()
 
+def get_contact_names_db(conn):
+    """
+    Returns the case-folded names of all contacts, used for duplicate checks during import.
+    Folded in Python rather than with SQLite's LOWER(), which only handles ASCII.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT name FROM contacts WHERE deleted_at IS NULL")
+    return {row[0].casefold() for row in cur}
+
+def add_contacts_bulk_db(conn, rows):
+    """
+    Inserts many (name, phone, email) rows in a single transaction.
+    Rows whose name already exists are skipped. Returns the number of rows inserted.
+    """
+    cur = conn.cursor()
+    with conn:
+        _purge_tombstones_named(cur, [row[0] for row in rows])
+        cur.executemany("INSERT OR IGNORE INTO contacts (name, phone, email) VALUES (?, ?, ?)", rows)
+    return cur.rowcount
+
+def iter_contacts_db(conn, batch_size=1000):
+    """Yields all contacts sorted by name, fetching batch_size rows at a time."""
+    cur = conn.cursor()
+    cur.row_factory = _contact_row
+    cur.execute("SELECT id, name, phone, email FROM contacts WHERE deleted_at IS NULL ORDER BY LOWER(name)")
+    while True:
+        rows = cur.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
 def update_contact_db(conn, contact_id, name, phone, email):
     """Update existing contact. Returns True if updated, False if name conflicts with another contact."""
     cur = conn.cursor()
     # Check name conflict: another record (different id) with same name (case-insensitive)
-    cur.execute("SELECT id FROM contacts WHERE LOWER(name)=LOWER(?) AND id<>?", (name.strip(), contact_id))
+    cur.execute(
+        "SELECT id FROM contacts WHERE LOWER(name)=LOWER(?) AND id<>? AND deleted_at IS NULL",
+        (name.strip(), contact_id)
+    )
     conflict = cur.fetchone()
     if conflict:
         return False
+    cur.execute("DELETE FROM contacts WHERE LOWER(name)=LOWER(?) AND id<>? AND deleted_at IS NOT NULL",
+                (name.strip(), contact_id))
     cur.execute(
         "UPDATE contacts SET name = ?, phone = ?, email = ? WHERE id = ?",
         (name.strip(), phone.strip(), email.strip(), contact_id)
@@ -66,7 +321,105 @@ def update_contact_db(conn, contact_id, name, phone, email):
     return True
 
 def delete_contact_db(conn, contact_id):
-    """Deletes a contact by id."""
+    """Soft-deletes a contact by id (see soft_delete_contacts_db)."""
+    soft_delete_contacts_db(conn, [contact_id])
+
+def _purge_tombstones_named(cur, names):
+    cur.executemany(
+        "DELETE FROM contacts WHERE LOWER(name) = LOWER(?) AND deleted_at IS NOT NULL",
+        ((name,) for name in names)
+    )
+
+def _get_contacts_by_id(cur, contact_ids):
+    cur.row_factory = _contact_row
+    rows = []
+    for contact_id in contact_ids:
+        cur.execute("SELECT id, name, phone, email FROM contacts WHERE id = ? AND deleted_at IS NULL", (contact_id,))
+        row = cur.fetchone()
+        if row:
+            rows.append(row)
+    return rows
+
+def soft_delete_contacts_db(conn, contact_ids):
+    """
+    Marks contacts as deleted in a single transaction, leaving tombstones that
+    restore_contacts_db can undo until they are purged. Returns the number deleted.
+    """
     cur = conn.cursor()
-    cur.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-    conn.commit()
\ No newline at end of file
+    now = time.time()
+    with conn:
+        cur.executemany(
+            "UPDATE contacts SET deleted_at = ? WHERE id = ? AND deleted_at IS NULL",
+            ((now, contact_id) for contact_id in contact_ids)
+        )
+    return cur.rowcount
+
+def restore_contacts_db(conn, contact_ids):
+    """Undoes a soft delete. Returns the restored contacts as Contact rows."""
+    cur = conn.cursor()
+    with conn:
+        cur.executemany(
+            "UPDATE contacts SET deleted_at = NULL WHERE id = ? AND deleted_at IS NOT NULL",
+            ((contact_id,) for contact_id in contact_ids)
+        )
+        return _get_contacts_by_id(cur, contact_ids)
+
+def update_contacts_bulk_db(conn, contact_ids, phone=None, email=None):
+    """
+    Sets phone and/or email on many contacts in a single transaction.
+    Fields left as None are not changed. Returns the updated contacts as Contact rows.
+    """
+    cur = conn.cursor()
+    with conn:
+        cur.executemany(
+            "UPDATE contacts SET phone = COALESCE(?, phone), email = COALESCE(?, email) "
+            "WHERE id = ? AND deleted_at IS NULL",
+            ((phone, email, contact_id) for contact_id in contact_ids)
+        )
+        return _get_contacts_by_id(cur, contact_ids)
+
+def purge_deleted_contacts_db(conn, older_than=PURGE_AFTER_SECONDS):
+    """
+    Permanently removes tombstones, and change-log entries, older than older_than seconds.
+    Returns the number of contacts removed.
+    """
+    cur = conn.cursor()
+    cutoff = time.time() - older_than
+    with conn:
+        cur.execute("DELETE FROM contacts WHERE deleted_at < ?", (cutoff,))
+        purged = cur.rowcount
+        # always keep the newest entry so the sequence never restarts
+        cur.execute(
+            "DELETE FROM contact_changes WHERE changed_at < ? AND seq < (SELECT MAX(seq) FROM contact_changes)",
+            (cutoff,)
+        )
+    return purged
+
+def get_last_change_seq_db(conn):
+    """Returns the newest change-log sequence number (0 if nothing has changed yet)."""
+    return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM contact_changes").fetchone()[0]
+
+def get_changes_since_db(conn, seq, limit=1000):
+    """
+    Returns up to limit changes after seq as (seq, contact_id, contact) tuples in order,
+    where contact is the contact's current Contact row, or None if it has been deleted.
+    Returns None if the log was purged past seq, in which case the caller must reload.
+    """
+    oldest = conn.execute("SELECT MIN(seq) FROM contact_changes").fetchone()[0]
+    if oldest is not None and seq < oldest - 1:
+        return None
+    cur = conn.execute(
+        """
+        SELECT ch.seq, ch.contact_id, c.id, c.name, c.phone, c.email
+        FROM contact_changes ch
+        LEFT JOIN contacts c ON c.id = ch.contact_id AND c.deleted_at IS NULL
+        WHERE ch.seq > ?
+        ORDER BY ch.seq
+        LIMIT ?
+        """,
+        (seq, limit)
+    )
+    return [
+        (change_seq, contact_id, Contact(*row) if row[0] is not None else None)
+        for change_seq, contact_id, *row in cur
+    ]
\ No newline at end of file
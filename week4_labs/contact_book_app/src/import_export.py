@@ -0,0 +1,171 @@
+# import_export.py
+import csv
+import re
+from pathlib import Path
+from database import add_contacts_bulk_db, get_contact_names_db, iter_contacts_db
+
+CHUNK_SIZE = 1000
+CSV_FIELDS = ("name", "phone", "email")
+
+def read_csv_contacts(path):
+    """
+    Yields (name, phone, email) tuples from a CSV file one row at a time.
+    A header row with name/phone/email columns is used if present, otherwise
+    the first three columns are taken in that order.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+        header = [col.strip().lower() for col in first]
+        if "name" in header:
+            columns = [header.index(field) if field in header else None for field in CSV_FIELDS]
+        else:
+            columns = [0, 1, 2]
+            yield _pick(first, columns)
+        for row in reader:
+            if row:
+                yield _pick(row, columns)
+
+def _pick(row, columns):
+    return tuple(row[i] if i is not None and i < len(row) else "" for i in columns)
+
+VCARD_ESCAPE = re.compile(r"\\(.)")
+
+def _unescape_vcard(value):
+    # one pass, so an escaped backslash followed by "n" stays a backslash and an "n"
+    return VCARD_ESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+def _unfold_lines(f):
+    """Joins folded vCard lines (continuations start with a space or tab)."""
+    current = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+def read_vcard_contacts(path):
+    """Yields (name, phone, email) tuples from a vCard (.vcf) file one card at a time."""
+    with open(path, encoding="utf-8-sig") as f:
+        card = None
+        for line in _unfold_lines(f):
+            key, sep, value = line.partition(":")
+            if not sep:
+                continue
+            # drop parameters (TEL;TYPE=CELL) and group prefixes (item1.EMAIL)
+            prop = key.split(";", 1)[0].rsplit(".", 1)[-1].upper()
+            if prop == "BEGIN" and value.strip().upper() == "VCARD":
+                card = {}
+            elif prop == "END" and value.strip().upper() == "VCARD":
+                if card is not None:
+                    parts = card.get("N", "").split(";")[:2]
+                    name = card.get("FN") or " ".join(_unescape_vcard(p) for p in reversed(parts) if p)
+                    yield (name, card.get("TEL", ""), card.get("EMAIL", ""))
+                card = None
+            elif card is not None and prop in ("FN", "N", "TEL", "EMAIL"):
+                # keep the first value of each property
+                card.setdefault(prop, _unescape_vcard(value) if prop != "N" else value)
+
+def read_contacts(path):
+    """Picks the reader for a file based on its extension (.csv or .vcf/.vcard)."""
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return read_csv_contacts(path)
+    if suffix in (".vcf", ".vcard"):
+        return read_vcard_contacts(path)
+    raise ValueError(f"Unsupported file type: {suffix or path}")
+
+def validate_contact(name, phone, email):
+    """Returns a cleaned (name, phone, email) tuple, or None if the record is not usable."""
+    name = (name or "").strip()
+    phone = (phone or "").strip()
+    email = (email or "").strip()
+    if not name:
+        return None
+    if email and "@" not in email:
+        return None
+    return (name, phone, email)
+
+def import_contacts(conn, path, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    Streams contacts from a CSV or vCard file into the database.
+    Records are validated, deduplicated case-insensitively against the database
+    and the file itself, and inserted in transactions of chunk_size rows.
+    progress, if given, is called with the number of records processed so far
+    after each chunk. Returns a dict with imported/duplicates/invalid counts.
+    """
+    seen = get_contact_names_db(conn)
+    result = {"imported": 0, "duplicates": 0, "invalid": 0}
+    processed = 0
+    chunk = []
+
+    def flush():
+        result["imported"] += add_contacts_bulk_db(conn, chunk)
+        chunk.clear()
+        if progress:
+            progress(processed)
+
+    for record in read_contacts(path):
+        processed += 1
+        contact = validate_contact(*record)
+        if contact is None:
+            result["invalid"] += 1
+            continue
+        key = contact[0].casefold()
+        if key in seen:
+            result["duplicates"] += 1
+            continue
+        seen.add(key)
+        chunk.append(contact)
+        if len(chunk) >= chunk_size:
+            flush()
+
+    flush()
+    return result
+
+def _escape_vcard(value):
+    return (value.replace("\\", "\\\\").replace("\n", "\\n")
+                 .replace(",", "\\,").replace(";", "\\;"))
+
+def _vcard_name(name):
+    # N is family;given;additional;prefix;suffix - take the last word as the family name
+    given, _, family = name.rpartition(" ")
+    if not given:
+        given, family = family, ""
+    return f"{_escape_vcard(family)};{_escape_vcard(given)};;;"
+
+def export_contacts(conn, path):
+    """
+    Streams all contacts to a CSV or vCard file, chosen by the file extension.
+    Returns the number of contacts written.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in (".csv", ".vcf", ".vcard"):
+        raise ValueError(f"Unsupported file type: {suffix or path}")
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if suffix == ".csv":
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+            for _, name, phone, email in iter_contacts_db(conn):
+                writer.writerow((name, phone or "", email or ""))
+                count += 1
+        else:
+            for _, name, phone, email in iter_contacts_db(conn):
+                f.write("BEGIN:VCARD\r\nVERSION:3.0\r\n")
+                f.write(f"FN:{_escape_vcard(name)}\r\n")
+                f.write(f"N:{_vcard_name(name)}\r\n")
+                if phone:
+                    f.write(f"TEL:{_escape_vcard(phone)}\r\n")
+                if email:
+                    f.write(f"EMAIL:{_escape_vcard(email)}\r\n")
+                f.write("END:VCARD\r\n")
+                count += 1
+    return count
@@ -1,7 +1,11 @@
 # main.py
 import flet as ft
-from database import init_db
-from app_logic import display_contacts, add_contact
+from database import init_db, AsyncDB, QueryMetrics
+from contact_index import ContactIndex
+from app_logic import (
+    Selection, load_contacts, display_contacts, add_contact, import_contacts_file, export_contacts_file,
+    confirm_bulk_delete, open_bulk_edit_dialog, purge_deleted_contacts, sync_contacts,
+)
 
 def main(page: ft.Page):
     page.title = "Contact Book"
@@ -9,25 +13,103 @@ def main(page: ft.Page):
     page.window_height = 700
     page.theme_mode = ft.ThemeMode.LIGHT
 
-    db_conn = init_db()
+    db = AsyncDB(init_db(), metrics_hook=QueryMetrics())
+    page.on_close = lambda e: db.close()
+    index = ContactIndex()
 
     name_input = ft.TextField(label="Name", width=360, hint_text="Full name")
     phone_input = ft.TextField(label="Phone", width=360, hint_text="09xx-xxx-xxxx")
     email_input = ft.TextField(label="Email", width=360, hint_text="name@example.com")
+    def on_search(e):
+        display_contacts(page, contacts_list_view, db, index, search_field.value)
+
     search_field = ft.TextField(
         label="Search",
         width=360,
         prefix=ft.Icon(ft.Icons.SEARCH),
-        on_change=lambda e: display_contacts(page, contacts_list_view, db_conn, search_field.value)
+        on_change=on_search
     )
     inputs = (name_input, phone_input, email_input)
 
     contacts_list_view = ft.ListView(expand=True, spacing=6, auto_scroll=False)
+
+    # Multi-select toolbar, shown while contacts are ticked
+    selection_text = ft.Text("", size=12, weight=ft.FontWeight.W_600)
+
+    def update_selection_bar():
+        count = len(selection.ids)
+        selection_text.value = f"{count} selected"
+        selection_bar.visible = count > 0
+        page.update()
+
+    def clear_selection(e):
+        selection.clear()
+        display_contacts(page, contacts_list_view, db, index, search_field.value)
+
+    selection = Selection(on_change=update_selection_bar)
+    contacts_list_view.data = selection
+    selection_bar = ft.Row(
+        [
+            selection_text,
+            ft.Row(
+                [
+                    ft.IconButton(
+                        icon=ft.Icons.EDIT, tooltip="Edit selected",
+                        on_click=lambda e: open_bulk_edit_dialog(page, db, index, contacts_list_view, search_field.value)
+                    ),
+                    ft.IconButton(
+                        icon=ft.Icons.DELETE, tooltip="Delete selected",
+                        on_click=lambda e: confirm_bulk_delete(page, db, index, contacts_list_view, search_field.value)
+                    ),
+                    ft.IconButton(icon=ft.Icons.CLOSE, tooltip="Clear selection", on_click=clear_selection),
+                ],
+                spacing=0
+            ),
+        ],
+        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+        visible=False
+    )
     # Buttons 
+    async def on_add(e):
+        await add_contact(page, inputs, contacts_list_view, db, index, search_field)
+
     add_button = ft.FilledButton(
         "Add Contact",
         icon=ft.Icons.PERSON_ADD,
-        on_click=lambda e: add_contact(page, inputs, contacts_list_view, db_conn, search_field)
+        on_click=on_add
+    )
+
+    # Import / export
+    import_status = ft.Text("", size=12, visible=False)
+
+    async def on_import_result(e: ft.FilePickerResultEvent):
+        if e.files:
+            await import_contacts_file(page, e.files[0].path, contacts_list_view, db, index, search_field, import_status)
+
+    async def on_export_result(e: ft.FilePickerResultEvent):
+        if e.path:
+            await export_contacts_file(page, e.path, db)
+
+    import_picker = ft.FilePicker(on_result=on_import_result)
+    export_picker = ft.FilePicker(on_result=on_export_result)
+    page.overlay.extend([import_picker, export_picker])
+
+    import_button = ft.IconButton(
+        icon=ft.Icons.UPLOAD_FILE,
+        tooltip="Import contacts (CSV, vCard)",
+        on_click=lambda e: import_picker.pick_files(
+            dialog_title="Import contacts",
+            allowed_extensions=["csv", "vcf"],
+        )
+    )
+    export_button = ft.IconButton(
+        icon=ft.Icons.DOWNLOAD,
+        tooltip="Export contacts (CSV, vCard)",
+        on_click=lambda e: export_picker.save_file(
+            dialog_title="Export contacts",
+            file_name="contacts.csv",
+            allowed_extensions=["csv", "vcf"],
+        )
     )
 
     theme_toggle = ft.IconButton(icon=ft.Icons.DARK_MODE, tooltip="Toggle Theme")
@@ -79,8 +161,16 @@ def main(page: ft.Page):
 
     contact_section = ft.Column(
         [
-            ft.Text("Contacts", size=16, weight=ft.FontWeight.W_600),
+            ft.Row(
+                [
+                    ft.Text("Contacts", size=16, weight=ft.FontWeight.W_600),
+                    ft.Row([import_button, export_button], spacing=0)
+                ],
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN
+            ),
             search_field,
+            import_status,
+            selection_bar,
             ft.Container(content=contacts_list_view, expand=True)
         ],
         expand=True,
@@ -103,7 +193,9 @@ def main(page: ft.Page):
     )
 
     apply_textfield_style()
-    display_contacts(page, contacts_list_view, db_conn)
+    page.run_task(load_contacts, page, contacts_list_view, db, index)
+    page.run_task(purge_deleted_contacts, db)
+    page.run_task(sync_contacts, page, contacts_list_view, db, index, search_field)
 
 if __name__ == "__main__":
     ft.app(target=main)